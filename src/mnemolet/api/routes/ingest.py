@@ -1,19 +1,24 @@
+import hashlib
 import logging
-import secrets
+import os
+import tempfile
+from collections.abc import Callable
 from pathlib import Path
+from typing import BinaryIO
 
 from fastapi import (
     APIRouter,
     File,
+    HTTPException,
     Query,
     UploadFile,
 )
+from starlette.concurrency import run_in_threadpool
 
 from mnemolet.config import (
-    BATCH_SIZE,
+    CHUNK_SIZE,
     QDRANT_COLLECTION,
     QDRANT_URL,
-    SIZE_CHARS,
     UPLOAD_DIR,
 )
 
@@ -22,49 +27,154 @@ logger = logging.getLogger(__name__)
 api_router = APIRouter()
 
 
-@api_router.post("/ingest")
+@api_router.post("/ingest", status_code=202)
 async def ingest_files(
     files: list[UploadFile] = File(...),
     force: bool = Query(
-        False, description="Recreate Qdrant collection before ingestion"
+        False, description="Re-ingest uploads whose content is already indexed"
     ),
 ):
     """
-    Ingest multiple files into Qdrant.
+    Upload files and queue their ingestion into Qdrant.
+
+    Poll GET /ingest/jobs/{job_id} for progress.
     """
-    saved_files, result = await do_ingestion(files, force)
+    saved_files, known_files, job_id = await do_ingestion(files, force)
 
     return {
-        "status": "ok",
+        "status": "queued" if job_id is not None else "ok",
+        "job_id": job_id,
         "uploaded": saved_files,
+        "known": known_files,
         "force": force,
-        "message": "Ingestion complete",
-        "ingestion": {
-            "files": result["files"],
-            "chunks": result["chunks"],
-            "time": result["time"],
-        },
+        "message": "Ingestion queued" if job_id is not None else "Nothing new",
     }
 
 
+@api_router.get("/ingest/jobs/{job_id}")
+def ingest_job(job_id: int):
+    """
+    State and live progress (files, chunks, stage timings) of an ingest job.
+    """
+    from mnemolet.cuore.storage.job_store import JobStore
+
+    job = JobStore().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@api_router.post("/ingest/jobs/{job_id}/cancel")
+def cancel_ingest_job(job_id: int):
+    """
+    Cancel a queued job, or stop a running one at its next progress update.
+    """
+    from mnemolet.cuore.storage.job_store import JobStore
+
+    store = JobStore()
+    if store.request_cancel(job_id):
+        return {"status": "ok", "job": store.get_job(job_id)}
+    if store.get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    raise HTTPException(status_code=409, detail=f"Job {job_id} already finished")
+
+
 async def do_ingestion(files, force: bool = False):
-    from mnemolet.cuore.ingestion.ingest import ingest
+    """
+    Store uploads under their content hash and queue a job ingesting
+    exactly those files.
 
+    Uploads whose content is already indexed are not stored again (unless
+    force), they are returned as known. If an earlier job left some of the
+    uploads incomplete (cancelled or killed), the job resumes them. The job
+    ID is None when there is nothing new to ingest.
+    """
+    from mnemolet.cuore.ingestion.jobs import get_worker
+    from mnemolet.cuore.storage.db_tracker import DBTracker
+
+    # engine setup is blocking IO too
+    tracker = await run_in_threadpool(DBTracker)
     saved_files = []
+    saved_hashes = []
+    known_files = []
 
     for f in files:
-        ext = Path(f.filename).suffix
-        safe_name = f"{secrets.token_hex(8)}{ext}"
-        dest = UPLOAD_DIR / safe_name
+        # blocking file IO, keep it off the event loop
+        dest, file_hash = await run_in_threadpool(
+            store_upload,
+            f.file,
+            Path(f.filename).suffix,
+            UPLOAD_DIR,
+            None if force else tracker.is_indexed,
+        )
+        if dest is None:
+            logger.info(f"Upload {f.filename} already ingested ({file_hash})")
+            known_files.append(f.filename)
+        elif str(dest) not in saved_files:
+            saved_files.append(str(dest))
+            saved_hashes.append(file_hash)
+
+    job_id = None
+    if saved_files:
+        # tracked but not indexed: an earlier job did not finish them
+        resume = await run_in_threadpool(
+            lambda: any(
+                tracker.file_exists(h) and not tracker.is_indexed(h)
+                for h in saved_hashes
+            )
+        )
+        job_id = await run_in_threadpool(
+            get_worker().submit, saved_files, force, resume
+        )
+
+    return saved_files, known_files, job_id
+
+
+def store_upload(
+    src: BinaryIO,
+    ext: str,
+    upload_dir: Path,
+    known: Callable[[str], bool] | None = None,
+) -> tuple[Path | None, str]:
+    """
+    Copy an upload to upload_dir in CHUNK_SIZE pieces while hashing it.
 
-        content = await f.read()
-        dest.write_bytes(content)
+    The file is named <sha256><ext>, so a re-upload of the same content
+    lands on the existing file. If known(hash) is true the copy is dropped.
 
-        saved_files.append(str(dest))
+    Returns:
+        (stored path or None if known, content hash)
+    """
+    hasher = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(dir=upload_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                out.write(chunk)
+        file_hash = hasher.hexdigest()
+        if known is not None and known(file_hash):
+            return None, file_hash
+        dest = (upload_dir / f"{file_hash}{ext.lower()}").resolve()
+        if not dest.exists():
+            os.replace(tmp, dest)
+        return dest, file_hash
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+@api_router.post("/sync")
+def sync_directory(
+    directory: str = Query(..., description="Directory to garbage-collect"),
+):
+    """
+    Remove vectors and tracked records of files deleted from a directory.
+    """
+    from mnemolet.cuore.ingestion.sync import sync
 
-    batch_size = BATCH_SIZE
-    result = ingest(
-        UPLOAD_DIR, batch_size, QDRANT_URL, QDRANT_COLLECTION, SIZE_CHARS, force=force
-    )
+    if not Path(directory).is_dir():
+        raise HTTPException(status_code=404, detail=f"Not a directory: {directory}")
 
-    return saved_files, result
+    result = sync(directory, QDRANT_URL, QDRANT_COLLECTION)
+    return {"status": "ok", "sync": result}
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -6,7 +7,18 @@ from fastapi.staticfiles import StaticFiles
 from mnemolet.api.app import api_router
 from mnemolet.ui.routes import ui_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from mnemolet.cuore.ingestion.jobs import get_worker
+
+    # resumes ingest jobs interrupted by a restart
+    worker = get_worker()
+    yield
+    worker.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 BASE_DIR = Path(__file__).resolve().parent
 
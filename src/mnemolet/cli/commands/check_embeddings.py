@@ -0,0 +1,55 @@
+import click
+
+from mnemolet.config import EMBED_BACKEND, EMBED_MODEL
+
+# used when no texts file is given
+SAMPLE_TEXTS = [
+    "MnemoLet indexes local documents and answers questions about them.",
+    "The quarterly report shows revenue growth of 12% over last year.",
+    "def hash_file(path): return hashlib.sha256(path.read_bytes()).hexdigest()",
+    "Il treno per Milano parte dal binario 4 alle 8:15.",
+    "Photosynthesis converts light energy into chemical energy in plants.",
+    "Error: connection refused while contacting the Qdrant server on port 6333.",
+    "Meeting notes: agree on the release date, then freeze the API.",
+    "A short one.",
+]
+
+
+@click.command(name="check-embeddings")
+@click.option(
+    "--backend",
+    default=EMBED_BACKEND,
+    show_default=True,
+    type=click.Choice(["torch", "onnx", "int8"]),
+    help="Embedding backend to compare with the torch fp32 reference.",
+)
+@click.option(
+    "--texts",
+    "texts_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="File with one text per line (default: built-in samples).",
+)
+def check_embeddings(backend: str, texts_file: str | None):
+    """
+    Report cosine drift and speed of an embedding backend against torch fp32.
+    """
+    from mnemolet.cuore.embeddings.local_llm_embed import check_parity
+
+    if texts_file:
+        with open(texts_file, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = SAMPLE_TEXTS
+
+    result = check_parity(texts, backend, EMBED_MODEL)
+
+    click.echo(f"Model {result['model']}, {result['texts']} texts")
+    click.echo(
+        f"{backend} vs torch fp32: mean cosine {result['mean_cosine']:.5f}, "
+        f"min cosine {result['min_cosine']:.5f}, max drift {result['max_drift']:.5f}"
+    )
+    click.echo(
+        f"Speed: {result['speed']:.1f} texts/s "
+        f"(torch fp32 {result['reference_speed']:.1f} texts/s, "
+        f"{result['speed'] / result['reference_speed']:.2f}x)"
+    )
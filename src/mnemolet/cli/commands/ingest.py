@@ -3,10 +3,19 @@ import logging
 import click
 
 from mnemolet.config import (
+    AUDIO_WORKERS,
     BATCH_SIZE,
+    CHUNKER,
+    EMBED_WORKERS,
+    EXCLUDE,
+    FOLLOW_SYMLINKS,
+    INCLUDE,
+    MAX_FILE_SIZE,
     QDRANT_COLLECTION,
     QDRANT_URL,
+    SANDBOX,
     SIZE_CHARS,
+    WORKERS,
 )
 
 from .utils import requires_qdrant
@@ -25,9 +34,97 @@ logger = logging.getLogger(__name__)
     show_default=True,
     help="Number of chunks per batch.",
 )
+@click.option(
+    "--workers",
+    default=WORKERS,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of extraction processes.",
+)
+@click.option(
+    "--audio-workers",
+    default=AUDIO_WORKERS,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of Whisper processes transcribing audio files up front.",
+)
+@click.option(
+    "--embed-workers",
+    default=EMBED_WORKERS,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of embedding processes, each with its own model copy.",
+)
+@click.option(
+    "--chunker",
+    default=CHUNKER,
+    show_default=True,
+    type=click.Choice(["tokens", "chars"]),
+    help="Split text to fit the embedding model's max sequence length "
+    "or every size_chars characters.",
+)
+@click.option(
+    "--sandbox/--no-sandbox",
+    default=SANDBOX,
+    show_default=True,
+    help="Extract each file in a child process with a timeout and memory cap, "
+    "failing files are skipped by later runs unless --force.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Re-ingest files an interrupted run left incomplete.",
+)
+@click.option(
+    "--verify",
+    is_flag=True,
+    help="Hash every file instead of trusting unchanged size/mtime/inode.",
+)
+@click.option(
+    "--include",
+    multiple=True,
+    default=INCLUDE,
+    show_default=True,
+    help="Only ingest files matching this glob (repeatable).",
+)
+@click.option(
+    "--exclude",
+    multiple=True,
+    help="Skip files and directories matching this glob (repeatable), "
+    "in addition to the configured excludes.",
+)
+@click.option(
+    "--max-file-size",
+    default=MAX_FILE_SIZE,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Skip files larger than this many bytes (0 = no limit).",
+)
+@click.option(
+    "--follow-symlinks/--no-follow-symlinks",
+    default=FOLLOW_SYMLINKS,
+    show_default=True,
+    help="Follow symlinked files and directories.",
+)
 @click.pass_context
 @requires_qdrant
-def ingest(ctx, directory: str, force: bool, batch_size: int):
+def ingest(
+    ctx,
+    directory: str,
+    force: bool,
+    batch_size: int,
+    workers: int,
+    audio_workers: int,
+    embed_workers: int,
+    chunker: str,
+    sandbox: bool,
+    resume: bool,
+    verify: bool,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    max_file_size: int,
+    follow_symlinks: bool,
+):
     """
     Ingest files from a directory into Qdrant.
     - streams files, chunks them, embeds text and stores data in Qdrant.
@@ -35,10 +132,44 @@ def ingest(ctx, directory: str, force: bool, batch_size: int):
     from mnemolet.cuore.ingestion.ingest import ingest
 
     result = ingest(
-        directory, batch_size, QDRANT_URL, QDRANT_COLLECTION, SIZE_CHARS, force=force
+        directory,
+        batch_size,
+        QDRANT_URL,
+        QDRANT_COLLECTION,
+        SIZE_CHARS,
+        force=force,
+        workers=workers,
+        audio_workers=audio_workers,
+        embed_workers=embed_workers,
+        chunker=chunker,
+        sandbox=sandbox,
+        verify=verify,
+        resume=resume,
+        include=list(include),
+        exclude=[*EXCLUDE, *exclude],
+        max_file_size=max_file_size,
+        follow_symlinks=follow_symlinks,
     )
 
     click.echo(
         f"Ingestion complete: {result['files']} files, {result['chunks']} stored in "
-        f"Qdrant in {result['time']:.1f}s.\n"
+        f"Qdrant ({result['reused']} reused vectors) in {result['time']:.1f}s.\n"
     )
+    if result["failed"]:
+        click.echo(
+            f"{result['failed']} files failed extraction, they are skipped "
+            "until --force."
+        )
+    if result["audio"].get("files"):
+        audio = result["audio"]
+        click.echo(
+            f"Transcribed {audio['files']} audio files ({audio['audio']:.0f}s) "
+            f"at {audio['speed']:.1f} audio-s/s."
+        )
+    for worker, s in result["embed_workers"].items():
+        click.echo(
+            f"embed worker {worker}: {s['chunks']} chunks in {s['time']:.1f}s "
+            f"({s['speed']:.1f} chunks/s)"
+        )
+    for stage, t in result["stages"].items():
+        click.echo(f"{stage:8}: busy {t['busy']:.1f}s, waiting {t['wait']:.1f}s")
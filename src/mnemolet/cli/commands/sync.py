@@ -0,0 +1,37 @@
+import click
+
+from mnemolet.config import (
+    EXCLUDE,
+    QDRANT_COLLECTION,
+    QDRANT_URL,
+)
+
+from .utils import requires_qdrant
+
+
+@click.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--exclude",
+    multiple=True,
+    help="Also remove files and directories matching this glob (repeatable), "
+    "in addition to the configured excludes.",
+)
+@requires_qdrant
+def sync(directory: str, exclude: tuple[str, ...]):
+    """
+    Remove vectors and tracked records of files deleted from a directory.
+    """
+    from mnemolet.cuore.ingestion.sync import sync
+
+    result = sync(
+        directory,
+        QDRANT_URL,
+        QDRANT_COLLECTION,
+        exclude=[*EXCLUDE, *exclude],
+    )
+
+    click.echo(
+        f"Sync complete: {result['removed']} of {result['checked']} tracked files "
+        f"removed in {result['time']:.1f}s."
+    )
@@ -7,6 +7,7 @@ import click
 
 from mnemolet.cli.commands.answer import answer
 from mnemolet.cli.commands.chat import chat
+from mnemolet.cli.commands.check_embeddings import check_embeddings
 from mnemolet.cli.commands.config import init_config
 from mnemolet.cli.commands.dashboard import dashboard
 from mnemolet.cli.commands.ingest import ingest
@@ -15,6 +16,7 @@ from mnemolet.cli.commands.remove import remove
 from mnemolet.cli.commands.search import search
 from mnemolet.cli.commands.serve import serve
 from mnemolet.cli.commands.stats import stats
+from mnemolet.cli.commands.sync import sync
 from mnemolet.config import (
     QDRANT_URL,
 )
@@ -83,6 +85,7 @@ def cli(ctx, verbose):
 def register_commands():
     cli.add_command(init_config)
     cli.add_command(ingest)
+    cli.add_command(sync)
     cli.add_command(search)
     cli.add_command(answer)
     cli.add_command(stats)
@@ -91,6 +94,7 @@ def register_commands():
     cli.add_command(serve)
     cli.add_command(dashboard)
     cli.add_command(chat)
+    cli.add_command(check_embeddings)
 
 
 register_commands()
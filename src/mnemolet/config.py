@@ -36,15 +36,58 @@ DEFAULT_CONFIG = {
         "batch_size": 100,
         "chunk_size": 1048576,
         "size_chars": 3000,
+        "chunker": "tokens",
+        "chunk_overlap": 32,
+        "workers": 1,
+        "queue_size": 4,
+        "include": [],
+        "exclude": [
+            ".git",
+            ".hg",
+            ".svn",
+            "node_modules",
+            "__pycache__",
+            ".venv",
+            "venv",
+            ".tox",
+            ".mypy_cache",
+            ".pytest_cache",
+            ".ruff_cache",
+        ],
+        "max_file_size": 0,
+        "follow_symlinks": False,
+        "pdf_workers": 1,
+        "pdf_page_timeout": 30,
+        "sandbox": False,
+        "extract_timeout": 300,
+        "extract_max_memory": 2048,
     },
     "embedding": {
         "model": "all-MiniLM-L6-v2",
-        "batch_size": 100,
+        "batch_size": 32,
+        "bucketing": True,
+        "backend": "torch",
+        "cache": True,
+        "workers": 1,
+        "threads_per_worker": 0,
+        "affinity": True,
+        "query_max_wait_ms": 5,
+        "query_max_batch": 32,
+        "cache_dir": "./data/embeddings",
+    },
+    "audio": {
+        "model_size": "small",
+        "language": "",
+        "batch_size": 16,
+        "workers": 1,
+        "cpu_threads": 0,
+        "cache_dir": "./data/transcripts",
     },
     "ollama": {"host": "localhost", "port": 11434, "model": "llama3", "prompt": prompt},
     "storage": {
         "db_path": "./data/tracker.sqlite",
         "upload_dir": "./data/uploads",
+        "write_batch": 500,
     },
 }
 
@@ -89,9 +132,94 @@ CHUNK_SIZE = int(
     os.getenv("CHUNK_SIZE", config["ingestion"].get("chunk_size", 1048576))
 )
 SIZE_CHARS = int(os.getenv("SIZE_CHARS", config["ingestion"].get("size_chars", 3000)))
+# "tokens" = sized to the embedding model's max_seq_length, "chars" = SIZE_CHARS
+CHUNKER = os.getenv("CHUNKER", config["ingestion"].get("chunker", "tokens"))
+# tokens shared by consecutive token chunks
+CHUNK_OVERLAP = int(
+    os.getenv("CHUNK_OVERLAP", config["ingestion"].get("chunk_overlap", 32))
+)
+WORKERS = int(os.getenv("WORKERS", config["ingestion"].get("workers", 1)))
+QUEUE_SIZE = int(os.getenv("QUEUE_SIZE", config["ingestion"].get("queue_size", 4)))
+INCLUDE = config["ingestion"].get("include", [])
+EXCLUDE = config["ingestion"].get("exclude", DEFAULT_CONFIG["ingestion"]["exclude"])
+# bytes, 0 = no limit
+MAX_FILE_SIZE = int(
+    os.getenv("MAX_FILE_SIZE", config["ingestion"].get("max_file_size", 0))
+)
+FOLLOW_SYMLINKS = bool(config["ingestion"].get("follow_symlinks", False))
+# processes extracting page ranges of a PDF, 1 = serial
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", config["ingestion"].get("pdf_workers", 1)))
+# seconds before a PDF page is skipped, 0 = no limit
+PDF_PAGE_TIMEOUT = float(
+    os.getenv("PDF_PAGE_TIMEOUT", config["ingestion"].get("pdf_page_timeout", 30))
+)
+# extract each file in a child process under the limits below
+SANDBOX = bool(config["ingestion"].get("sandbox", False))
+# seconds per file in the sandbox, 0 = no limit
+EXTRACT_TIMEOUT = float(
+    os.getenv("EXTRACT_TIMEOUT", config["ingestion"].get("extract_timeout", 300))
+)
+# bytes per sandbox process (configured in MB), 0 = no limit
+EXTRACT_MAX_MEMORY = (
+    int(
+        os.getenv(
+            "EXTRACT_MAX_MEMORY", config["ingestion"].get("extract_max_memory", 2048)
+        )
+    )
+    << 20
+)
 
 EMBED_MODEL = os.getenv("EMBED_MODEL", config["embedding"]["model"])
-EMBED_BATCH = int(os.getenv("EMBED_BATCH", config["embedding"].get("batch_size", 100)))
+# texts per model forward pass
+EMBED_BATCH = int(os.getenv("EMBED_BATCH", config["embedding"].get("batch_size", 32)))
+# group texts of similar token length into the same forward pass
+EMBED_BUCKETING = bool(config["embedding"].get("bucketing", True))
+# torch (fp32), onnx (ONNX Runtime, CPU) or int8 (dynamically quantized torch, CPU)
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", config["embedding"].get("backend", "torch"))
+# on-disk vectors by chunk hash, reused instead of re-embedding
+EMBED_CACHE = bool(config["embedding"].get("cache", True))
+# embedding processes, each with its own model copy, 1 = in-process
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", config["embedding"].get("workers", 1)))
+# torch threads per embedding process, 0 = available cores / workers
+EMBED_THREADS = int(
+    os.getenv("EMBED_THREADS", config["embedding"].get("threads_per_worker", 0))
+)
+# pin each embedding process to its own slice of the cores
+EMBED_AFFINITY = bool(config["embedding"].get("affinity", True))
+# how long a query waits for concurrent ones to share a forward pass
+QUERY_MAX_WAIT_MS = float(
+    os.getenv("QUERY_MAX_WAIT_MS", config["embedding"].get("query_max_wait_ms", 5))
+)
+# most queries encoded in one forward pass
+QUERY_MAX_BATCH = int(
+    os.getenv("QUERY_MAX_BATCH", config["embedding"].get("query_max_batch", 32))
+)
+EMBED_CACHE_DIR = Path(
+    os.path.expanduser(
+        os.getenv(
+            "EMBED_CACHE_DIR",
+            config["embedding"].get("cache_dir", "./data/embeddings"),
+        )
+    )
+)
+
+audio_config = config.get("audio", {})
+# Whisper model size, e.g. tiny, base, small, medium, large-v3
+AUDIO_MODEL = os.getenv("AUDIO_MODEL", audio_config.get("model_size", "small"))
+# empty = detect the language of each file
+AUDIO_LANGUAGE = os.getenv("AUDIO_LANGUAGE", audio_config.get("language", ""))
+AUDIO_BATCH_SIZE = int(
+    os.getenv("AUDIO_BATCH_SIZE", audio_config.get("batch_size", 16))
+)
+# Whisper processes transcribing audio files in parallel, 1 = in extraction
+AUDIO_WORKERS = int(os.getenv("AUDIO_WORKERS", audio_config.get("workers", 1)))
+# threads split between audio workers, 0 = all cores
+AUDIO_CPU_THREADS = int(
+    os.getenv("AUDIO_CPU_THREADS", audio_config.get("cpu_threads", 0))
+)
+TRANSCRIPT_DIR = Path(
+    os.path.expanduser(audio_config.get("cache_dir", "./data/transcripts"))
+)
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", config["ollama"]["host"])
 OLLAMA_PORT = int(os.getenv("OLLAMA_PORT", config["ollama"].get("port", 11434)))
@@ -100,6 +228,10 @@ OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", config["ollama"]["model"])
 OLLAMA_PROMPT = os.getenv("OLLAMA_PROMPT", config["ollama"]["prompt"])
 
 DB_PATH = Path(os.path.expanduser(config["storage"]["db_path"]))
+# tracked files written per transaction during ingest
+DB_WRITE_BATCH = int(
+    os.getenv("DB_WRITE_BATCH", config["storage"].get("write_batch", 500))
+)
 
 UPLOAD_DIR = Path(config["storage"]["upload_dir"])
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
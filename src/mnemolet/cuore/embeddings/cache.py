@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import os
+import struct
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from mnemolet.config import EMBED_CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:  # not on Windows, single writer assumed there
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# index entry: SHA-256 digest of the chunk text, row in the .vec file
+_ENTRY = struct.Struct("<32sQ")
+
+
+class EmbeddingCache:
+    """
+    Append-only on-disk embeddings keyed by chunk content hash.
+
+    One pair of files per model id, normalization flag and dimension:
+    <key>.vec holds float32 rows back to back, <key>.idx an entry
+    (chunk digest, row) per row. A row is written before its entry, a torn
+    tail is ignored on open and cut off by the next append, so an
+    interrupted run loses at most the rows it was writing. Appends take an
+    exclusive lock, processes sharing the cache see each other's rows on
+    their next open.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        dim: int,
+        normalize: bool = False,
+        cache_dir: Path = EMBED_CACHE_DIR,
+    ):
+        self.dim = dim
+        self.cache_dir = Path(cache_dir)
+        key = hashlib.sha256(
+            f"{model_id}|normalize={normalize}|dim={dim}".encode()
+        ).hexdigest()[:16]
+        self.vec_path = self.cache_dir / f"{key}.vec"
+        self.idx_path = self.cache_dir / f"{key}.idx"
+        self._row_bytes = dim * 4
+        self._rows: dict[bytes, int] = {}
+        self._mmap = None
+        self._lock = threading.Lock()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+        logger.info(
+            f"[EMBED CACHE] {len(self._rows)} vectors for {model_id} "
+            f"(normalize={normalize}) in {self.vec_path.name}"
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, hashes: list[str]) -> dict[str, np.ndarray]:
+        """
+        Return cached vectors by chunk hash (hex SHA-256), misses left out.
+        """
+        with self._lock:
+            found = {}
+            for h in hashes:
+                row = self._rows.get(bytes.fromhex(h))
+                if row is not None:
+                    found[h] = row
+            if not found:
+                return {}
+            mmap = self._map(max(found.values()) + 1)
+            rows = np.array(mmap[list(found.values())])
+        return dict(zip(found, rows))
+
+    def put(self, hashes: list[str], vectors: np.ndarray) -> None:
+        """
+        Append vectors of chunks not cached yet.
+        """
+        with self._lock:
+            new = {}
+            for h, vector in zip(hashes, vectors):
+                digest = bytes.fromhex(h)
+                if digest not in self._rows:
+                    new[digest] = vector
+            if not new:
+                return
+
+            with (
+                open(self.vec_path, "ab") as vec_file,
+                open(self.idx_path, "ab") as idx_file,
+            ):
+                if fcntl is not None:
+                    fcntl.flock(idx_file, fcntl.LOCK_EX)
+                # drop torn tails so appended rows and entries stay aligned
+                size = _truncate_tail(vec_file, self._row_bytes)
+                _truncate_tail(idx_file, _ENTRY.size)
+                first = size // self._row_bytes
+
+                block = np.asarray(list(new.values()), dtype=np.float32)
+                vec_file.write(block.tobytes())
+                vec_file.flush()
+                idx_file.write(
+                    b"".join(
+                        _ENTRY.pack(digest, first + i) for i, digest in enumerate(new)
+                    )
+                )
+            for i, digest in enumerate(new):
+                self._rows[digest] = first + i
+
+    def _load(self) -> None:
+        if not self.idx_path.exists() or not self.vec_path.exists():
+            return
+        rows = self.vec_path.stat().st_size // self._row_bytes
+        data = self.idx_path.read_bytes()
+        usable = len(data) - len(data) % _ENTRY.size
+        for digest, row in _ENTRY.iter_unpack(data[:usable]):
+            # entry without its row: the row write was interrupted
+            if row < rows:
+                self._rows[digest] = row
+
+    def _map(self, rows: int) -> np.memmap:
+        """
+        Memory-map the .vec file, remapped once it has grown past the map.
+        """
+        if self._mmap is None or len(self._mmap) < rows:
+            total = self.vec_path.stat().st_size // self._row_bytes
+            self._mmap = np.memmap(
+                self.vec_path, dtype=np.float32, mode="r", shape=(total, self.dim)
+            )
+        return self._mmap
+
+
+def _truncate_tail(f, record_size: int) -> int:
+    """
+    Cut a partially written record off the end of f, return the new size.
+    """
+    size = os.fstat(f.fileno()).st_size
+    if size % record_size:
+        size -= size % record_size
+        f.truncate(size)
+    return size
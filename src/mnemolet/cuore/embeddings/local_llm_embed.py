@@ -1,15 +1,88 @@
+import importlib.util
 import logging
 import threading
-from typing import Iterable, Iterator, Optional
+import time
+from typing import Callable, Iterable, Iterator, Optional
 
 import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer
 
+from mnemolet.config import (
+    EMBED_BACKEND,
+    EMBED_BATCH,
+    EMBED_BUCKETING,
+    EMBED_CACHE,
+    EMBED_MODEL,
+    EMBED_WORKERS,
+)
+from mnemolet.cuore.embeddings.cache import EmbeddingCache
+from mnemolet.cuore.utils.utils import hash_text
+
 logger = logging.getLogger(__name__)
 
+# vectors of different models or backends must never be mixed up
+EMBED_MODEL_ID = f"{EMBED_MODEL}@{EMBED_BACKEND}"
+
 _model: Optional[SentenceTransformer] = None
 _model_lock = threading.Lock()
+# normalize flag -> cache of the shared model's vectors
+_caches: dict[bool, EmbeddingCache] = {}
+# multi-process pool, built for workers > 1
+_pool = None
+
+
+def _load_torch(model_name: str) -> SentenceTransformer:
+    """
+    Reference fp32 torch model, GPU if available.
+    """
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    return SentenceTransformer(model_name, device=device)
+
+
+def _load_onnx(model_name: str) -> SentenceTransformer:
+    """
+    ONNX Runtime on CPU, the model is exported on first load if the hub
+    repo ships no ONNX weights.
+    """
+    if importlib.util.find_spec("optimum") is None:
+        raise ImportError(
+            "The onnx embedding backend needs optimum and onnxruntime: "
+            "pip install 'sentence-transformers[onnx]'"
+        )
+    return SentenceTransformer(model_name, device="cpu", backend="onnx")
+
+
+def _load_int8(model_name: str) -> SentenceTransformer:
+    """
+    torch on CPU with Linear layers dynamically quantized to int8.
+    """
+    model = SentenceTransformer(model_name, device="cpu")
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+# embedding.backend -> loader, every backend yields a SentenceTransformer
+BACKENDS: dict[str, Callable[[str], SentenceTransformer]] = {
+    "torch": _load_torch,
+    "onnx": _load_onnx,
+    "int8": _load_int8,
+}
+
+
+def load_model(
+    model_name: str = EMBED_MODEL, backend: str = EMBED_BACKEND
+) -> SentenceTransformer:
+    """
+    Load an embedding model with one of BACKENDS.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown embedding backend: {backend} (choose from {', '.join(BACKENDS)})"
+        )
+    logger.info(f"[EMBED] Loading {model_name} with backend '{backend}'")
+    return BACKENDS[backend](model_name)
 
 
 def _get_model() -> SentenceTransformer:
@@ -17,8 +90,7 @@ def _get_model() -> SentenceTransformer:
     if _model is None:
         with _model_lock:
             if _model is None:
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-                _model = SentenceTransformer("all-MiniLM-L6-v2", device=device)
+                _model = load_model()
     return _model
 
 
@@ -31,23 +103,173 @@ def get_dimension() -> int:
     return _get_model().get_embedding_dimension()
 
 
+def _get_cache(normalize: bool) -> EmbeddingCache:
+    dim = get_dimension()
+    with _model_lock:
+        if normalize not in _caches:
+            _caches[normalize] = EmbeddingCache(EMBED_MODEL_ID, dim, normalize)
+        return _caches[normalize]
+
+
+def get_pool(workers: int):
+    """
+    Return the shared EmbeddingPool, rebuilt if the worker count changed.
+    """
+    global _pool
+    from mnemolet.cuore.embeddings.pool import EmbeddingPool
+
+    with _model_lock:
+        if _pool is None or _pool.workers != workers:
+            if _pool is not None:
+                _pool.close()
+            _pool = EmbeddingPool(workers)
+        return _pool
+
+
+def release_pool() -> None:
+    """
+    Stop the shared EmbeddingPool's processes, if any.
+    """
+    global _pool
+    with _model_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
 def embed_texts_batch(
     texts: Iterable[str],
     batch_size: int = 512,
     show_progress: bool = False,
+    normalize: bool = False,
+    use_cache: bool = EMBED_CACHE,
+    encode_batch: int = EMBED_BATCH,
+    bucketing: bool = EMBED_BUCKETING,
+    workers: int = EMBED_WORKERS,
 ) -> Iterator[np.ndarray]:
+    """
+    Yield float32 embeddings of texts, batch_size rows at a time.
+
+    - each yielded batch is run through the model encode_batch texts at a
+      time; with bucketing, texts of the whole batch are grouped by length
+      so short ones are not padded to the longest in the batch.
+    - with use_cache, texts embedded before by the same model and backend
+      are read from the on-disk EmbeddingCache, only the rest is encoded.
+    - workers > 1 splits each batch across an EmbeddingPool of processes.
+    """
     model = _get_model()
+    cache = _get_cache(normalize) if use_cache else None
+    pool = get_pool(workers) if workers > 1 else None
+
+    def encode(batch: list[str]) -> np.ndarray:
+        if pool is not None:
+            return pool.encode(batch, normalize, encode_batch, bucketing)
+        return _encode_texts(
+            model, batch, show_progress, normalize, encode_batch, bucketing
+        )
+
     batch = []
     for text in texts:
         batch.append(text)
         if len(batch) >= batch_size:
-            embeddings = model.encode(
-                batch, show_progress_bar=show_progress, convert_to_numpy=True
-            ).astype(np.float32)
-            yield embeddings
+            yield _encode_cached(encode, batch, cache)
             batch = []
     if batch:
-        embeddings = model.encode(
-            batch, show_progress_bar=show_progress, convert_to_numpy=True
-        ).astype(np.float32)
-        yield embeddings
+        yield _encode_cached(encode, batch, cache)
+
+
+def _encode_texts(
+    model: SentenceTransformer,
+    texts: list[str],
+    show_progress: bool,
+    normalize: bool,
+    encode_batch: int,
+    bucketing: bool,
+) -> np.ndarray:
+    """
+    Encode texts encode_batch at a time, rows are returned in the order of
+    texts. encode sorts the texts of each call by length itself: with
+    bucketing all texts go in one call, so similar lengths share a forward
+    pass across the whole batch.
+    """
+    step = max(1, len(texts) if bucketing else encode_batch)
+    out = np.empty((len(texts), model.get_embedding_dimension()), dtype=np.float32)
+    for i in range(0, len(texts), step):
+        out[i : i + step] = model.encode(
+            texts[i : i + step],
+            batch_size=encode_batch,
+            show_progress_bar=show_progress,
+            convert_to_numpy=True,
+            normalize_embeddings=normalize,
+        )
+    return out
+
+
+def _encode_cached(
+    encode: Callable[[list[str]], np.ndarray],
+    batch: list[str],
+    cache: EmbeddingCache | None,
+) -> np.ndarray:
+    if cache is None:
+        return encode(batch)
+
+    hashes = [hash_text(text) for text in batch]
+    vectors = cache.get(hashes)
+    # first occurrence of every text missing from the cache
+    missing = {}
+    for text, h in zip(batch, hashes):
+        if h not in vectors:
+            missing.setdefault(h, text)
+    if missing:
+        fresh = encode(list(missing.values()))
+        cache.put(list(missing), fresh)
+        vectors.update(zip(missing, fresh))
+    logger.debug(f"[EMBED] {len(batch)} texts, {len(missing)} not cached")
+    return np.vstack([vectors[h] for h in hashes])
+
+
+def cosine_similarities(reference: np.ndarray, other: np.ndarray) -> np.ndarray:
+    """
+    Row-wise cosine similarity of two (n, dim) embedding matrices.
+    """
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    other = other / np.linalg.norm(other, axis=1, keepdims=True)
+    return np.sum(reference * other, axis=1)
+
+
+def check_parity(
+    texts: list[str],
+    backend: str,
+    model_name: str = EMBED_MODEL,
+    batch_size: int = 64,
+) -> dict:
+    """
+    Compare a backend's embeddings with the torch fp32 reference.
+
+    Returns:
+        mean/min cosine similarity to the reference, max drift
+        (1 - min cosine) and texts per second of both backends.
+    """
+    speeds = {}
+    embeddings = {}
+    for name in ("torch", backend):
+        model = load_model(model_name, name)
+        # warm up, first call pays for lazy init
+        model.encode(texts[:batch_size], batch_size=batch_size)
+        start = time.perf_counter()
+        embeddings[name] = model.encode(
+            texts, batch_size=batch_size, convert_to_numpy=True
+        )
+        speeds[name] = len(texts) / (time.perf_counter() - start)
+
+    cosines = cosine_similarities(embeddings["torch"], embeddings[backend])
+    return {
+        "model": model_name,
+        "backend": backend,
+        "texts": len(texts),
+        "mean_cosine": float(cosines.mean()),
+        "min_cosine": float(cosines.min()),
+        "max_drift": float(1.0 - cosines.min()),
+        "reference_speed": speeds["torch"],
+        "speed": speeds[backend],
+    }
@@ -0,0 +1,159 @@
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from mnemolet.config import (
+    EMBED_AFFINITY,
+    EMBED_BACKEND,
+    EMBED_MODEL,
+    EMBED_THREADS,
+)
+
+logger = logging.getLogger(__name__)
+
+# per worker process: (index, model)
+_worker = None
+
+
+class EmbeddingPool:
+    """
+    Processes each holding its own copy of the embedding model.
+
+    Every worker runs threads torch threads (0 = available cores split
+    evenly) and, with affinity, is pinned to its own slice of the cores so
+    workers do not compete for them. A batch is split into one shard per
+    worker, rows come back in input order.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        threads: int = EMBED_THREADS,
+        affinity: bool = EMBED_AFFINITY,
+        model_name: str = EMBED_MODEL,
+        backend: str = EMBED_BACKEND,
+    ):
+        cores = _available_cores()
+        self.workers = workers
+        self.threads = threads or max(1, len(cores) // workers)
+        # spawn: parent may already hold torch threads, fork is not safe then
+        ctx = multiprocessing.get_context("spawn")
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(
+                ctx.Value("i", 0),
+                model_name,
+                backend,
+                self.threads,
+                cores if affinity else None,
+            ),
+        )
+        self._stats: dict[int, dict] = {}
+        self._lock = threading.Lock()
+        logger.info(
+            f"[EMBED POOL] {workers} workers x {self.threads} threads "
+            f"({'pinned' if affinity else 'unpinned'}, {len(cores)} cores)"
+        )
+
+    def encode(
+        self,
+        texts: list[str],
+        normalize: bool,
+        encode_batch: int,
+        bucketing: bool,
+    ) -> np.ndarray:
+        """
+        Encode texts across the workers, each runs its shard through the
+        model encode_batch texts at a time.
+        """
+        shard = max(1, math.ceil(len(texts) / self.workers))
+        futures = [
+            self._pool.submit(
+                _encode_shard, texts[i : i + shard], normalize, encode_batch, bucketing
+            )
+            for i in range(0, len(texts), shard)
+        ]
+        parts = []
+        for future in futures:
+            index, vectors, seconds = future.result()
+            parts.append(vectors)
+            with self._lock:
+                stat = self._stats.setdefault(index, {"chunks": 0, "time": 0.0})
+                stat["chunks"] += len(vectors)
+                stat["time"] += seconds
+        return np.vstack(parts)
+
+    def stats(self) -> dict[int, dict]:
+        """
+        Chunks, busy seconds and chunks/sec per worker since the last reset.
+        """
+        with self._lock:
+            return {
+                index: {
+                    "chunks": s["chunks"],
+                    "time": round(s["time"], 3),
+                    "speed": round(s["chunks"] / s["time"], 1) if s["time"] else 0.0,
+                }
+                for index, s in sorted(self._stats.items())
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _available_cores() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _init_worker(
+    counter,
+    model_name: str,
+    backend: str,
+    threads: int,
+    cores: list[int] | None,
+) -> None:
+    global _worker
+    import torch
+
+    from mnemolet.cuore.embeddings.local_llm_embed import load_model
+
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+
+    if cores and hasattr(os, "sched_setaffinity"):
+        start = index * threads % len(cores)
+        pinned = [cores[(start + i) % len(cores)] for i in range(threads)]
+        os.sched_setaffinity(0, pinned)
+        logger.info(f"[EMBED POOL] worker {index} pinned to cores {pinned}")
+    torch.set_num_threads(threads)
+
+    _worker = (index, load_model(model_name, backend))
+
+
+def _encode_shard(
+    texts: list[str], normalize: bool, encode_batch: int, bucketing: bool
+) -> tuple[int, np.ndarray, float]:
+    """
+    Worker: encode a shard, return (worker index, vectors, seconds).
+    """
+    from mnemolet.cuore.embeddings.local_llm_embed import _encode_texts
+
+    index, model = _worker
+    start = time.perf_counter()
+    vectors = _encode_texts(model, texts, False, normalize, encode_batch, bucketing)
+    return index, vectors, time.perf_counter() - start
@@ -0,0 +1,92 @@
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+
+import numpy as np
+
+from mnemolet.config import QUERY_MAX_BATCH, QUERY_MAX_WAIT_MS
+
+logger = logging.getLogger(__name__)
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+class QueryBatcher:
+    """
+    Embed concurrent queries in shared model calls.
+
+    The first waiting query opens a batch, queries arriving within
+    max_wait_ms join it (up to max_batch) and the whole batch is encoded
+    by one encode_fn call on a background thread. Every caller gets back
+    the vector of its own query.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[list[str]], np.ndarray],
+        max_wait_ms: float = QUERY_MAX_WAIT_MS,
+        max_batch: int = QUERY_MAX_BATCH,
+    ):
+        self.encode_fn = encode_fn
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+        self._queue: queue.Queue[tuple[str, Future]] = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="query-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def embed(self, query: str) -> np.ndarray:
+        """
+        Return the embedding of query, blocking until its batch is encoded.
+        """
+        future = Future()
+        self._queue.put((query, future))
+        return future.result()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._encode(batch)
+
+    def _encode(self, batch: list[tuple[str, Future]]) -> None:
+        try:
+            vectors = self.encode_fn([query for query, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        logger.debug(f"[QUERY] Encoded {len(batch)} queries in one call")
+        for (_, future), vector in zip(batch, vectors):
+            future.set_result(vector)
+
+
+def get_query_batcher() -> QueryBatcher:
+    """
+    Return the process-wide batcher over the shared embedding model.
+    """
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            from mnemolet.cuore.embeddings.local_llm_embed import get_model
+
+            model = get_model()
+            _batcher = QueryBatcher(
+                lambda queries: model.encode(
+                    queries, batch_size=len(queries), convert_to_numpy=True
+                )
+            )
+        return _batcher
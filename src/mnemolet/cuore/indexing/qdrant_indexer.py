@@ -3,18 +3,37 @@ import uuid
 
 import numpy as np
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, PointStruct, VectorParams
+from qdrant_client.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    MatchAny,
+    PayloadSchemaType,
+    PointStruct,
+    VectorParams,
+)
+
+from mnemolet.config import EMBED_MODEL
 
 logger = logging.getLogger(__name__)
 
 
+def point_id(model: str, file_hash: str, chunk_index: int) -> str:
+    """
+    Deterministic point id of a chunk: re-upserting it overwrites the point.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{model}/{file_hash}/{chunk_index}"))
+
+
 class QdrantIndexer:
-    def __init__(self, qdrant_url: str, collection_name: str):
+    def __init__(self, qdrant_url: str, collection_name: str, model: str = EMBED_MODEL):
         """
         Init Qdrant client using config.toml.
         """
         self.client = QdrantClient(url=qdrant_url)
         self.collection_name = collection_name
+        self.model = model
 
     def init_collection(self, vector_size: int = 384):
         """
@@ -25,6 +44,7 @@ class QdrantIndexer:
             collection_name=self.collection_name,
             vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
         )
+        self._create_payload_indexes()
 
     def ensure_collection(self, vector_size: int = 384):
         """
@@ -36,24 +56,36 @@ class QdrantIndexer:
                 collection_name=self.collection_name,
                 vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
             )
+            self._create_payload_indexes()
         else:
             logger.info(f"Collection {self.collection_name} already exists.")
 
+    def _create_payload_indexes(self):
+        """
+        Index path/hash payloads, deleting points of a file filters on them.
+        """
+        for field in ("path", "hash"):
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field,
+                field_schema=PayloadSchemaType.KEYWORD,
+            )
+
     def store_embeddings(
         self, chunks: list[str], embeddings: np.ndarray, metadata: list[dict[str, str]]
-    ):
+    ) -> list[str]:
         """
-        Store text embeddings in Qdrant.
+        Store text embeddings in Qdrant, return the point ids.
+
+        Chunks with an "index" in their metadata get deterministic ids
+        (model, file hash, chunk index), so retries and re-runs overwrite.
         """
-        payloads = [
-            {"path": m["path"], "hash": m["hash"], "text": chunk}
-            for m, chunk in zip(metadata, chunks)
-        ]
+        payloads = [{**m, "text": chunk} for m, chunk in zip(metadata, chunks)]
 
         # build Qdrand points
         points = [
             PointStruct(
-                id=str(uuid.uuid4()),
+                id=self._point_id(metadata[i]),
                 vector=embeddings[i],
                 payload=payloads[i],
             )
@@ -67,3 +99,39 @@ class QdrantIndexer:
         logger.info(
             f"Upserted → total points: {points_count}, indexed: {indexed_count}"
         )
+        return [point.id for point in points]
+
+    def _point_id(self, meta: dict) -> str:
+        if "index" not in meta:
+            return str(uuid.uuid4())
+        return point_id(self.model, meta["hash"], meta["index"])
+
+    def retrieve_vectors(self, point_ids: list[str]) -> dict[str, np.ndarray]:
+        """
+        Fetch stored vectors by point id, missing points are left out.
+        """
+        if not point_ids:
+            return {}
+        records = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=point_ids,
+            with_payload=False,
+            with_vectors=True,
+        )
+        return {str(r.id): np.asarray(r.vector, dtype=np.float32) for r in records}
+
+    def delete_files(self, hashes: list[str]) -> None:
+        """
+        Delete all points of the given files (by hash payload) in one call.
+        """
+        if not hashes:
+            return
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(
+                filter=Filter(
+                    must=[FieldCondition(key="hash", match=MatchAny(any=hashes))]
+                )
+            ),
+        )
+        logger.info(f"Deleted points of {len(hashes)} files")
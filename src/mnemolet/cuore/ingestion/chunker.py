@@ -0,0 +1,177 @@
+import bisect
+import copy
+import logging
+import re
+from collections.abc import Iterator
+from typing import NamedTuple, Protocol
+
+logger = logging.getLogger(__name__)
+
+# preferred split points, best first
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"[.!?…。](?:[\"')\]]*)\s")
+_LINE = re.compile(r"\n")
+
+
+class Chunk(NamedTuple):
+    """
+    Piece of a text with its [start, end) char offsets in that text.
+    """
+
+    text: str
+    start: int
+    end: int
+
+
+class Chunker(Protocol):
+    def split(self, text: str) -> Iterator[Chunk]: ...
+
+
+class CharChunker:
+    """
+    Split text at fixed char boundaries.
+    """
+
+    def __init__(self, max_length: int = 3000):
+        self.max_length = max_length
+
+    def split(self, text: str) -> Iterator[Chunk]:
+        for start in range(0, len(text), self.max_length):
+            end = min(start + self.max_length, len(text))
+            yield Chunk(text[start:end], start, end)
+
+
+class TokenChunker:
+    """
+    Split text into chunks of at most max_tokens tokens of the embedding model,
+    so nothing is cut off by its max_seq_length.
+
+    Each text is tokenized once. A chunk ends at the last paragraph, sentence
+    or line break in its second half if there is one, otherwise at a token
+    boundary. Consecutive chunks share overlap tokens.
+    """
+
+    def __init__(self, tokenizer, max_tokens: int, overlap: int = 0):
+        if max_tokens < 1:
+            raise ValueError(f"max_tokens must be positive, got {max_tokens}")
+        if not 0 <= overlap < max_tokens:
+            raise ValueError(f"overlap must be in [0, {max_tokens}), got {overlap}")
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+
+    def split(self, text: str) -> Iterator[Chunk]:
+        encoding = self.tokenizer(
+            text,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        offsets = [o for o in encoding["offset_mapping"] if o[1] > o[0]]
+        if not offsets:
+            return
+        starts = [s for s, _ in offsets]
+        n = len(offsets)
+
+        first = 0
+        while first < n:
+            last = min(first + self.max_tokens, n)
+            if last < n:
+                last = self._boundary(text, offsets, starts, first, last)
+
+            start, end = offsets[first][0], offsets[last - 1][1]
+            yield Chunk(text[start:end], start, end)
+
+            if last == n:
+                break
+            first = max(last - self.overlap, first + 1)
+
+    def _boundary(
+        self,
+        text: str,
+        offsets: list[tuple[int, int]],
+        starts: list[int],
+        first: int,
+        last: int,
+    ) -> int:
+        """
+        Return the token index to end a chunk at, preferring text boundaries
+        within the second half of the window.
+        """
+        lo = offsets[first + (last - first) // 2][0]
+        hi = offsets[last][0]  # start of the first token that does not fit
+        window = text[lo:hi]
+
+        for pattern in (_PARAGRAPH, _SENTENCE, _LINE):
+            matches = list(pattern.finditer(window))
+            if matches:
+                cut = lo + matches[-1].end()
+                # first token starting at/after the cut begins the next chunk
+                idx = bisect.bisect_left(starts, cut, first + 1, last + 1)
+                if first < idx <= last:
+                    return idx
+        return last
+
+
+class StreamingChunker:
+    """
+    Chunk a file that arrives in parts without materializing it.
+
+    All chunks of the buffered text but the last are emitted, the last one
+    is carried over and re-chunked together with the next part, so part
+    edges do not cut words or leave runt chunks. Offsets are relative to
+    the start of the file.
+    """
+
+    def __init__(self, chunker: Chunker):
+        self.chunker = chunker
+        self._buffer = ""
+        self._offset = 0
+
+    def feed(self, text: str) -> list[Chunk]:
+        """
+        Add the next part, return the chunks that are final.
+        """
+        self._buffer += text
+        chunks = list(self.chunker.split(self._buffer))
+        if not chunks:
+            return []
+
+        carry = chunks[-1].start
+        done = [self._shift(c) for c in chunks[:-1]]
+        self._buffer = self._buffer[carry:]
+        self._offset += carry
+        return done
+
+    def flush(self) -> list[Chunk]:
+        """
+        Chunk whatever is left at the end of a file and reset.
+        """
+        chunks = [self._shift(c) for c in self.chunker.split(self._buffer)]
+        self._buffer = ""
+        self._offset = 0
+        return chunks
+
+    def _shift(self, chunk: Chunk) -> Chunk:
+        return Chunk(chunk.text, self._offset + chunk.start, self._offset + chunk.end)
+
+
+def get_chunker(mode: str, size_chars: int, overlap: int = 0) -> Chunker:
+    """
+    Build the chunker for a mode: "chars" or "tokens" (embedding model tokens).
+    """
+    if mode == "chars":
+        return CharChunker(size_chars)
+    if mode != "tokens":
+        raise ValueError(f"Unknown chunker: {mode}")
+
+    from mnemolet.cuore.embeddings.local_llm_embed import get_model
+
+    model = get_model()
+    # own copy: the embed stage uses the model's tokenizer concurrently
+    tokenizer = copy.deepcopy(model.tokenizer)
+    max_seq_length = model.get_max_seq_length() or tokenizer.model_max_length
+    max_tokens = max_seq_length - tokenizer.num_special_tokens_to_add()
+    logger.info(f"[CHUNK] Token chunks of <= {max_tokens} tokens, overlap {overlap}")
+    return TokenChunker(tokenizer, max_tokens, overlap)
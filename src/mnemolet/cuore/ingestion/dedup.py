@@ -0,0 +1,74 @@
+import logging
+import threading
+from collections.abc import Callable
+
+import numpy as np
+
+from mnemolet.cuore.embeddings.local_llm_embed import EMBED_MODEL_ID
+from mnemolet.cuore.indexing.qdrant_indexer import QdrantIndexer
+from mnemolet.cuore.storage.db_tracker import DBTracker
+from mnemolet.cuore.utils.utils import hash_text
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkDedup:
+    """
+    Embed every distinct chunk once across the corpus.
+
+    Chunks are keyed by content hash salted with model_id (model and backend),
+    so switching either never reuses the old vectors. Repeated chunks in a
+    batch are embedded once, chunks seen in earlier batches or runs reuse the
+    vector of the point recorded for them in the tracker. Points deleted since
+    (file removed or changed) are simply embedded again.
+    """
+
+    def __init__(
+        self,
+        tracker: DBTracker,
+        indexer: QdrantIndexer,
+        embed_fn: Callable[[list[str]], np.ndarray],
+        model_id: str = EMBED_MODEL_ID,
+    ):
+        self.tracker = tracker
+        self.indexer = indexer
+        self.embed_fn = embed_fn
+        self.model_id = model_id
+        self.embedded = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+
+    def embed(self, chunks: list[str]) -> tuple[np.ndarray, list[str]]:
+        """
+        Return embeddings and (model salted) content hashes of chunks.
+        """
+        hashes = [hash_text(f"{self.model_id}\n{chunk}") for chunk in chunks]
+        # first occurrence of each distinct chunk in the batch
+        first = {}
+        for i, chunk_hash in enumerate(hashes):
+            first.setdefault(chunk_hash, i)
+
+        known = self.tracker.chunk_points(list(first))
+        stored = self.indexer.retrieve_vectors(list(set(known.values())))
+        # hash -> vector
+        vectors = {h: stored[p] for h, p in known.items() if p in stored}
+
+        missing = [h for h in first if h not in vectors]
+        if missing:
+            fresh = self.embed_fn([chunks[first[h]] for h in missing])
+            vectors.update(zip(missing, fresh))
+
+        with self._lock:
+            self.embedded += len(missing)
+            self.reused += len(chunks) - len(missing)
+        logger.debug(
+            f"[DEDUP] {len(chunks)} chunks: embedded {len(missing)}, "
+            f"reused {len(chunks) - len(missing)}"
+        )
+        return np.vstack([vectors[h] for h in hashes]), hashes
+
+    def record(self, hashes: list[str], point_ids: list[str]) -> None:
+        """
+        Remember which point holds the vector of each chunk.
+        """
+        self.tracker.add_chunks(dict(zip(hashes, point_ids)))
@@ -2,58 +2,139 @@ import logging
 from pathlib import Path
 from typing import Iterator
 
-import torch
-from faster_whisper import BatchedInferencePipeline, WhisperModel
-
-from mnemolet.cuore.ingestion.extractors.base import Extractor
+from mnemolet.config import AUDIO_BATCH_SIZE, AUDIO_LANGUAGE, AUDIO_MODEL
+from mnemolet.cuore.ingestion.extractors.base import Extractor, TextPart
+from mnemolet.cuore.ingestion.transcripts import Segment, TranscriptCache
+from mnemolet.cuore.utils.utils import hash_file
 
 logger = logging.getLogger(__name__)
 
 
-class AudioExtractor(Extractor):
-    extensions = {".wav", ".mp3"}
+def load_whisper(model_size: str, cpu_threads: int = 0):
+    """
+    Load a Whisper model and its batched pipeline (GPU if available).
 
-    def __init__(self, model_size="small", buffer_limit=15000):
-        super().__init__()  # init from base
+    Args:
+        model_size: Whisper model size or path.
+        cpu_threads: threads used on CPU, 0 = library default.
+    """
+    # heavy imports, only paid for once an audio file must be transcribed
+    import torch
+    from faster_whisper import BatchedInferencePipeline, WhisperModel
 
-        logger.info(f"[audio] Init Whisper model size='{model_size}'")
+    logger.info(f"[audio] Init Whisper model size='{model_size}'")
 
-        if torch.cuda.is_available():
-            device = "cuda"
-            compute_type = "float16"
-        else:
-            device = "cpu"
-            compute_type = "int8"
+    if torch.cuda.is_available():
+        device = "cuda"
+        compute_type = "float16"
+    else:
+        device = "cpu"
+        compute_type = "int8"
 
-        logger.info(f"[audio] Using device='{device}'")
+    logger.info(f"[audio] Using device='{device}'")
 
-        self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
-        self.pipeline = BatchedInferencePipeline(model=self.model)
-        # number of chars to accumulate before yeilding
-        self.buffer_limit = buffer_limit
+    model = WhisperModel(
+        model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads
+    )
+    return model, BatchedInferencePipeline(model=model)
+
+
+def transcribe(
+    pipeline, file: Path, language: str | None, batch_size: int = AUDIO_BATCH_SIZE
+) -> Iterator[Segment]:
+    """
+    Transcribe an audio file with a Whisper pipeline, yield its segments.
+    """
+    logger.info(f"[audio] Starting transcription: {file}'")
 
-    def extract(self, file: Path) -> Iterator[str]:
-        logger.info(f"[audio] Starting transcription: {file}'")
+    segments, info = pipeline.transcribe(
+        str(file), batch_size=batch_size, language=language
+    )
 
-        segments, info = self.pipeline.transcribe(str(file), batch_size=16)
+    logger.info(
+        f"[audio] Language: {info.language}'[audio] Duration: {info.duration:.2f}s'"
+    )
 
-        logger.info(
-            f"[audio] Language: {info.language}'[audio] Duration: {info.duration:.2f}s'"
-        )
+    for segment in segments:
+        yield Segment(segment.start, segment.end, segment.text)
 
-        buffer = ""
+    logger.info(f"[audio] Finished transcription: {file}")
 
-        for i, segment in enumerate(segments):
-            buffer += segment.text.strip() + " "
 
-            if len(buffer) >= self.buffer_limit:
-                logger.debug(f"[audio] yielding buffer block: len={len(buffer)}")
-                logger.debug(buffer[:300])
-                yield buffer
-                buffer = ""
+class AudioExtractor(Extractor):
+    extensions = {".wav", ".mp3"}
+
+    def __init__(
+        self,
+        model_size=AUDIO_MODEL,
+        buffer_limit=15000,
+        language=AUDIO_LANGUAGE,
+        cache: TranscriptCache | None = None,
+    ):
+        super().__init__()  # init from base
+
+        self.model_size = model_size
+        # None = detect per file
+        self.language = language or None
+        self.cache = cache or TranscriptCache()
+        self.model = None
+        self.pipeline = None
+        # number of chars to accumulate before yeilding
+        self.buffer_limit = buffer_limit
+
+    def _get_pipeline(self):
+        """
+        Load Whisper on the first transcript cache miss.
+        """
+        if self.pipeline is None:
+            self.model, self.pipeline = load_whisper(self.model_size)
+        return self.pipeline
+
+    def extract(self, file: Path, file_hash: str | None = None) -> Iterator[TextPart]:
+        """
+        Yield transcript blocks marked with the start time (seconds) of
+        every segment, from cache when this audio was transcribed before.
+        The file is only hashed if file_hash is not given.
+        """
+        file_hash = file_hash or hash_file(file)
+        segments = self.cache.get(file_hash, self.model_size, self.language)
+        if segments is None:
+            segments = self.cache.put(
+                file_hash, self.model_size, self.language, self._transcribe(file)
+            )
+
+        buffer = []
+        marks = []
+        size = 0
+
+        for segment in segments:
+            text = segment.text.strip() + " "
+            marks.append((size, segment.start))
+            buffer.append(text)
+            size += len(text)
+
+            if size >= self.buffer_limit:
+                logger.debug(f"[audio] yielding buffer block: len={size}")
+                yield TextPart("".join(buffer), "time", marks)
+                buffer, marks, size = [], [], 0
         if buffer:
-            logger.debug(f"[audio] yielding FINAL buffer block: len={len(buffer)}")
-            logger.debug(buffer[:300])
-            yield buffer
+            logger.debug(f"[audio] yielding FINAL buffer block: len={size}")
+            yield TextPart("".join(buffer), "time", marks)
+
+    def _transcribe(self, file: Path) -> Iterator[Segment]:
+        return transcribe(self._get_pipeline(), file, self.language)
+
+    def close(self) -> None:
+        """
+        Free the Whisper model.
+        """
+        if self.model is None:
+            return
 
-        logger.info(f"[audio] Finished transcription: {file}")
+        import torch
+
+        self.pipeline = None
+        self.model = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        logger.info("[audio] Released Whisper model")
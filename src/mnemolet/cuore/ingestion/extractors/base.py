@@ -9,6 +9,29 @@ logger = logging.getLogger(__name__)
 DEFAULT_CHUNK_SIZE = 1024 * 1024
 
 
+class TextPart(str):
+    """
+    Extracted text with position markers, e.g. where pages start.
+
+    key: name of the marked value, e.g. "page"
+    marks: (offset in this part, value) pairs, sorted by offset
+    """
+
+    key: str
+    marks: list[tuple[int, int | float]]
+
+    def __new__(
+        cls,
+        text: str,
+        key: str = "",
+        marks: list[tuple[int, int | float]] | None = None,
+    ):
+        part = super().__new__(cls, text)
+        part.key = key
+        part.marks = marks or []
+        return part
+
+
 class Extractor:
     """
     Base extractor class.
@@ -31,8 +54,14 @@ class Extractor:
                 f"Using default chunk size: {self.chunk_size}"
             )
 
-    def extract(self, file: Path) -> Iterator[str]:
+    def extract(self, file: Path, file_hash: str | None = None) -> Iterator[str]:
         """
-        Yield text chunks from file.
+        Yield text chunks from file, file_hash is its content hash when the
+        caller already computed it.
         """
         raise NotImplementedError("Subclasses must implement extract()")
+
+    def close(self) -> None:
+        """
+        Release models or other resources held by the extractor.
+        """
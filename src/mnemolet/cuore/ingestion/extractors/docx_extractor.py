@@ -8,5 +8,5 @@ from mnemolet.cuore.ingestion.loaders.docx_loader import extract_docx
 class DocxExtractor(Extractor):
     extensions = {".docx"}
 
-    def extract(self, file: Path) -> Iterator[str]:
+    def extract(self, file: Path, file_hash: str | None = None) -> Iterator[str]:
         yield from extract_docx(file, self.chunk_size)
@@ -8,5 +8,5 @@ from mnemolet.cuore.ingestion.loaders.odt_loader import extract_odt
 class OdtExtractor(Extractor):
     extensions = {".odt"}
 
-    def extract(self, file: Path) -> Iterator[str]:
+    def extract(self, file: Path, file_hash: str | None = None) -> Iterator[str]:
         yield from extract_odt(file, self.chunk_size)
@@ -1,12 +1,44 @@
+import logging
+from multiprocessing.pool import Pool
 from pathlib import Path
 from typing import Iterator
 
+from mnemolet.config import PDF_WORKERS
 from mnemolet.cuore.ingestion.extractors.base import Extractor
-from mnemolet.cuore.ingestion.loaders.pdf_loader import extract_pdf
+from mnemolet.cuore.ingestion.loaders.pdf_loader import extract_pdf, page_pool
+
+logger = logging.getLogger(__name__)
 
 
 class PDFExtractor(Extractor):
     extensions = {".pdf"}
 
-    def extract(self, file: Path) -> Iterator[str]:
-        yield from extract_pdf(file, self.chunk_size)
+    def __init__(self, workers: int = PDF_WORKERS):
+        super().__init__()
+        self.workers = workers
+        self.pool: Pool | None = None
+
+    def _get_pool(self) -> Pool:
+        """
+        Start the page pool with the first PDF worth splitting, it serves
+        every later PDF until close().
+        """
+        if self.pool is None:
+            self.pool = page_pool(self.workers)
+        return self.pool
+
+    def extract(self, file: Path, file_hash: str | None = None) -> Iterator[str]:
+        yield from extract_pdf(
+            file, self.chunk_size, self.workers, get_pool=self._get_pool
+        )
+
+    def close(self) -> None:
+        """
+        Stop the page pool.
+        """
+        if self.pool is None:
+            return
+        self.pool.terminate()
+        self.pool.join()
+        self.pool = None
+        logger.info("[PDF] Stopped page pool")
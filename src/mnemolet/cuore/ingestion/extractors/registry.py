@@ -1,6 +1,7 @@
 import importlib
 import logging
 import pkgutil
+import threading
 from pathlib import Path
 
 from mnemolet.cuore.ingestion.extractors.base import Extractor
@@ -10,22 +11,38 @@ from . import __path__
 
 logger = logging.getLogger(__name__)
 
-_EXTRACTOR_REGISTRY: dict[str, Extractor] | None = None
+_EXTRACTOR_REGISTRY: dict[str, type[Extractor]] | None = None
+# extractors built so far, one per class
+_EXTRACTORS: dict[type[Extractor], Extractor] = {}
+_lock = threading.Lock()
 
 
-def get_registry() -> dict[str, Extractor]:
+def _load_extractor_classes() -> list[type[Extractor]]:
     """
-    Load and return extractor registry lazily (after logging is configured).
+    Import all modules in extractors (except base and registry)
+    and return the Extractor subclasses they define.
+    """
+    for _, modname, _ in pkgutil.iter_modules(__path__):
+        if modname not in {"base", "registry"}:
+            importlib.import_module(f"{pkg_name}.{modname}")
+    return Extractor.__subclasses__()
+
+
+def supported_extensions() -> set[str]:
+    """
+    Return all file extensions handled by an extractor, without creating one.
+    """
+    return set(get_registry())
+
+
+def get_registry() -> dict[str, type[Extractor]]:
+    """
+    Load and return extension -> extractor class registry lazily.
     """
     global _EXTRACTOR_REGISTRY
     if _EXTRACTOR_REGISTRY is None:
-        # dynamically import all modules in extractors (except base and registry)
-        for _, modname, _ in pkgutil.iter_modules(__path__):
-            if modname not in {"base", "registry"}:
-                importlib.import_module(f"{pkg_name}.{modname}")
-
         _EXTRACTOR_REGISTRY = {
-            ext: cls() for cls in Extractor.__subclasses__() for ext in cls.extensions
+            ext: cls for cls in _load_extractor_classes() for ext in cls.extensions
         }
 
         logger.debug(f"EXTRACTOR_REGISTRY: {sorted(_EXTRACTOR_REGISTRY.keys())}")
@@ -35,6 +52,27 @@ def get_registry() -> dict[str, Extractor]:
 
 def get_extractor(file: Path) -> Extractor | None:
     """
-    Return registered extractor for the given file extension.
+    Return extractor for the given file extension, building it (and loading
+    its models) the first time a matching file is seen.
     """
-    return get_registry().get(file.suffix.lower())
+    cls = get_registry().get(file.suffix.lower())
+    if cls is None:
+        return None
+
+    with _lock:
+        if cls not in _EXTRACTORS:
+            logger.debug(f"Creating extractor {cls.__name__}")
+            _EXTRACTORS[cls] = cls()
+        return _EXTRACTORS[cls]
+
+
+def release_extractors() -> None:
+    """
+    Drop all built extractors and free their models.
+    """
+    with _lock:
+        extractors = list(_EXTRACTORS.values())
+        _EXTRACTORS.clear()
+
+    for extractor in extractors:
+        extractor.close()
@@ -47,7 +47,7 @@ class TextExtractor(Extractor):
         ".tpl",
     }
 
-    def extract(self, file: Path) -> Iterator[str]:
+    def extract(self, file: Path, file_hash: str | None = None) -> Iterator[str]:
         """
         Yield text chunks from a file.
         """
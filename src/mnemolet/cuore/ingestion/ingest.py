@@ -1,15 +1,41 @@
 import logging
 import time
+from collections.abc import Callable
 from pathlib import Path
 
+import numpy as np
 from tqdm import tqdm
 
+from mnemolet.config import (
+    AUDIO_WORKERS,
+    CHUNK_OVERLAP,
+    CHUNKER,
+    EMBED_MODEL,
+    EMBED_WORKERS,
+    EXCLUDE,
+    FOLLOW_SYMLINKS,
+    INCLUDE,
+    MAX_FILE_SIZE,
+    QUEUE_SIZE,
+    SANDBOX,
+)
 from mnemolet.cuore.embeddings.local_llm_embed import (
     get_dimension,
+    release_pool,
 )
 from mnemolet.cuore.indexing.qdrant_indexer import QdrantIndexer
-from mnemolet.cuore.ingestion.preprocessor import process_directory
-from mnemolet.cuore.storage.db_tracker import DBTracker
+from mnemolet.cuore.ingestion.chunker import get_chunker
+from mnemolet.cuore.ingestion.dedup import ChunkDedup
+from mnemolet.cuore.ingestion.extractors.registry import (
+    release_extractors,
+    supported_extensions,
+)
+from mnemolet.cuore.ingestion.pipeline import Pipeline
+from mnemolet.cuore.ingestion.preprocessor import process_files
+from mnemolet.cuore.ingestion.walker import FileEntry, walk_files
+from mnemolet.cuore.storage.db_tracker import DBTracker, FileIndex
+from mnemolet.cuore.storage.models import FileState
+from mnemolet.cuore.utils.utils import hash_file
 
 logger = logging.getLogger(__name__)
 
@@ -21,27 +47,134 @@ def ingest(
     collection_name: str,
     size_chars: int,
     force: bool,
+    workers: int = 1,
+    queue_size: int = QUEUE_SIZE,
+    verify: bool = False,
+    include: list[str] = INCLUDE,
+    exclude: list[str] = EXCLUDE,
+    max_file_size: int = MAX_FILE_SIZE,
+    follow_symlinks: bool = FOLLOW_SYMLINKS,
+    resume: bool = False,
+    chunker: str = CHUNKER,
+    chunk_overlap: int = CHUNK_OVERLAP,
+    audio_workers: int = AUDIO_WORKERS,
+    sandbox: bool = SANDBOX,
+    embed_workers: int = EMBED_WORKERS,
 ) -> dict:
     """
     Ingest files from a directory into Qdrant.
     - streams files, chunks them, embeds text and stores data in Qdrant.
+    - workers > 1 extracts files in a process pool.
+    - unchanged files are detected by stat, verify forces hashing them.
+    - the directory is walked once, honouring include/exclude globs,
+      max_file_size and follow_symlinks.
+    - extract/chunk, embedding and upsert run as concurrent stages joined
+      by queues of at most queue_size batches.
+    - every file moves discovered -> extracted -> embedded -> indexed,
+      resume re-ingests files an interrupted run left incomplete.
+    - chunker "tokens" sizes chunks to the embedding model's max sequence
+      length (chunk_overlap tokens shared), "chars" splits every size_chars.
+    - identical chunks are embedded once, repeats reuse the stored vector.
+    - a modified file has the vectors of its old version deleted and is
+      re-ingested on its own.
+    - audio_workers > 1 transcribes new audio files up front in a pool of
+      Whisper processes, extraction then reads the cached transcripts.
+    - embed_workers > 1 embeds in a pool of processes, chunks/sec of every
+      worker are reported.
+    - sandbox extracts every file in a child process with a timeout and
+      memory cap, files failing extraction are recorded as failed and
+      skipped by later runs unless forced.
     """
 
-    start_total = time.time()
-    directory = Path(directory)
+    start_walk = time.perf_counter()
+    files = list(
+        walk_files(
+            Path(directory),
+            supported_extensions(),
+            include=include,
+            exclude=exclude,
+            max_file_size=max_file_size,
+            follow_symlinks=follow_symlinks,
+        )
+    )
+    logger.info(
+        f"Found {len(files)} files to ingest from {directory} "
+        f"in {time.perf_counter() - start_walk:.2f}s."
+    )
+
+    return ingest_files(
+        files,
+        batch_size,
+        qdrant_url,
+        collection_name,
+        size_chars,
+        force,
+        workers=workers,
+        queue_size=queue_size,
+        verify=verify,
+        resume=resume,
+        chunker=chunker,
+        chunk_overlap=chunk_overlap,
+        audio_workers=audio_workers,
+        sandbox=sandbox,
+        embed_workers=embed_workers,
+        recreate=force,
+    )
 
-    files = list(directory.rglob("*"))
-    files = [f for f in files if f.is_file()]
+
+def ingest_files(
+    files: list[FileEntry],
+    batch_size: int,
+    qdrant_url: str,
+    collection_name: str,
+    size_chars: int,
+    force: bool,
+    workers: int = 1,
+    queue_size: int = QUEUE_SIZE,
+    verify: bool = False,
+    resume: bool = False,
+    chunker: str = CHUNKER,
+    chunk_overlap: int = CHUNK_OVERLAP,
+    audio_workers: int = AUDIO_WORKERS,
+    sandbox: bool = SANDBOX,
+    embed_workers: int = EMBED_WORKERS,
+    progress: Callable[[dict], None] | None = None,
+    recreate: bool = False,
+    keep_pool: bool = False,
+) -> dict:
+    """
+    Ingest the given files into Qdrant, see ingest() for the options.
+
+    force re-ingests the given files, replacing their points; recreate
+    empties the whole collection first (what ingest() does for force).
+    keep_pool leaves the embedding pool running for the next call (call
+    release_pool() when done), by default it is stopped with the run.
+
+    progress is called with files/chunks so far and stage timings when a
+    file starts and a batch is handed over; an exception it raises aborts
+    the run (files left incomplete are picked up by resume).
+    """
+    start_total = time.time()
     if not files:
         logger.warning("No files found to ingest.")
-        return {"files": 0, "chunks": 0, "time": 0.0}
-    logger.info(f"Found {len(files)} files to ingest from {directory}.")
+        return {
+            "files": 0,
+            "chunks": 0,
+            "reused": 0,
+            "failed": 0,
+            "time": 0.0,
+            "stages": {},
+            "audio": {},
+            "embed_workers": {},
+        }
 
-    logger.info(f"Starting ingestion from {directory}")
+    logger.info(f"Starting ingestion of {len(files)} files")
 
     # SQLite db
     tracker = DBTracker()
-    indexer = QdrantIndexer(qdrant_url, collection_name)
+    # incomplete files of other runs are left alone
+    index = FileIndex(tracker, resume=resume, paths=(str(f.path) for f in files))
+    indexer = QdrantIndexer(qdrant_url, collection_name, EMBED_MODEL)
     embedding_dim = get_dimension()
     # runs only if there is no collection
     indexer.ensure_collection(vector_size=embedding_dim)
@@ -55,50 +188,220 @@ def ingest(
 
     seen_files = set()
 
-    if force:
+    if recreate:
         embedding_dim = get_dimension()
         logger.info(f"Recreating Qdrant collection (dim={embedding_dim})..")
         indexer.init_collection(vector_size=embedding_dim)
+        tracker.clear_chunks()
+    elif resume and index.incomplete:
+        # drop partial points, the files are ingested again from scratch
+        logger.info(f"Resuming {len(index.incomplete)} incomplete files..")
+        indexer.delete_files(list(index.incomplete))
+    elif index.incomplete:
+        logger.warning(
+            f"{len(index.incomplete)} files were not fully ingested by a previous "
+            "run, use --resume to finish them."
+        )
 
-    for data in process_directory(directory, tracker, force, size_chars):
-        file_path = data["path"]
-        file_hash = data["hash"]
-        chunk = data["chunk"]
-
-        if file_path not in seen_files:
-            logger.info(f"Processing file #{total_files}: {file_path}")
-            total_files += 1
-            seen_files.add(file_path)
-            pbar.update(1)  # increment progress bar
-
-        # add to current batch
-        chunk_batch.append(chunk)
-        metadata_batch.append({"path": file_path, "hash": file_hash})
-        total_chunks += 1
-
-        # if batch full —> embed & store
-        if len(chunk_batch) >= batch_size:
-            _store_batch(indexer, chunk_batch, metadata_batch)
-            chunk_batch.clear()
-            metadata_batch.clear()
-
-    # handle the rest
-    if chunk_batch:
-        _store_batch(indexer, chunk_batch, metadata_batch)
+    audio = {}
+    hashes = {}
+    if audio_workers > 1:
+        audio, hashes = _warm_transcripts(files, index, force, verify, audio_workers)
+
+    text_chunker = get_chunker(chunker, size_chars, chunk_overlap)
+    pool = None
+    if embed_workers > 1:
+        from mnemolet.cuore.embeddings.local_llm_embed import get_pool
+
+        pool = get_pool(embed_workers)
+        pool.reset_stats()
+    dedup = ChunkDedup(
+        tracker, indexer, lambda texts: _embed_texts(texts, embed_workers)
+    )
+
+    pipeline = Pipeline(
+        [
+            ("embed", lambda batch: _embed_batch(dedup, index, *batch)),
+            ("store", lambda batch: _store_batch(indexer, dedup, index, *batch)),
+        ],
+        queue_size=queue_size,
+    )
+
+    start_extract = time.perf_counter()
+    try:
+        with pipeline:
+            for data in process_files(
+                files,
+                index,
+                force,
+                size_chars,
+                workers,
+                verify,
+                # nothing to purge from a recreated collection
+                purge=None if recreate else indexer.delete_files,
+                chunker=text_chunker,
+                sandbox=sandbox,
+                hashes=hashes,
+            ):
+                file_path = data["path"]
+                chunk = data["chunk"]
+
+                if file_path not in seen_files:
+                    logger.info(f"Processing file #{total_files}: {file_path}")
+                    total_files += 1
+                    seen_files.add(file_path)
+                    pbar.update(1)  # increment progress bar
+                    if progress is not None:
+                        progress(_progress(files, total_files, total_chunks, pipeline))
+
+                # add to current batch
+                chunk_batch.append(chunk)
+                # everything but the text itself ends up in the payload
+                metadata_batch.append({k: v for k, v in data.items() if k != "chunk"})
+                total_chunks += 1
+
+                # if batch full —> hand over to embed & store stages
+                if len(chunk_batch) >= batch_size:
+                    # files extracted by now have all their chunks in this
+                    # or an earlier batch, they complete with this one
+                    pipeline.put((chunk_batch, metadata_batch, index.take_extracted()))
+                    chunk_batch = []
+                    metadata_batch = []
+                    if progress is not None:
+                        progress(_progress(files, total_files, total_chunks, pipeline))
+
+            # handle the rest (may be only completions of chunkless files)
+            pipeline.put((chunk_batch, metadata_batch, index.take_extracted()))
+            extract_time = time.perf_counter() - start_extract
+    finally:
+        # persist states reached so far, also when interrupted
+        index.flush()
+        # free models (e.g. Whisper) loaded for this run
+        release_extractors()
+        embed_stats = {}
+        if pool is not None:
+            embed_stats = pool.stats()
+            # don't keep pinned processes alive between runs unless asked
+            if not keep_pool:
+                release_pool()
 
     pbar.close()
 
+    stages = {
+        "extract": {
+            "busy": round(extract_time - pipeline.wait, 3),
+            "wait": round(pipeline.wait, 3),
+        },
+        **pipeline.timings(),
+    }
+    logger.info(f"Stage timings: {stages}")
+    logger.info(f"Chunks embedded: {dedup.embedded}, reused: {dedup.reused}")
+
     total_time = time.time() - start_total
 
-    return {"files": total_files, "chunks": total_chunks, "time": total_time}
+    return {
+        "files": total_files,
+        "chunks": total_chunks,
+        "reused": dedup.reused,
+        "failed": index.failed,
+        "time": total_time,
+        "stages": stages,
+        "audio": audio,
+        "embed_workers": embed_stats,
+    }
+
+
+def _progress(
+    files: list[FileEntry], done: int, chunks: int, pipeline: Pipeline
+) -> dict:
+    return {
+        "files": done,
+        "total_files": len(files),
+        "chunks": chunks,
+        "stages": pipeline.timings(),
+    }
+
+
+def _warm_transcripts(
+    files: list[FileEntry],
+    index: FileIndex,
+    force: bool,
+    verify: bool,
+    workers: int,
+) -> tuple[dict, dict[str, str]]:
+    """
+    Transcribe the audio files this run will extract with a worker pool.
+
+    Returns:
+        transcription stats and path -> hash of the audio files hashed, so
+        the loader does not hash them again.
+    """
+    from mnemolet.cuore.ingestion.transcriber import is_audio, transcribe_files
+
+    todo = []
+    hashes = {}
+    for path, stat in files:
+        if not is_audio(path):
+            continue
+        if not force and not verify and index.is_unchanged(str(path), stat):
+            continue
+        file_hash = hashes[str(path)] = hash_file(path)
+        if not force and index.file_exists(file_hash):
+            continue
+        todo.append((path, file_hash))
+
+    return transcribe_files(todo, workers), hashes
 
 
-def _store_batch(indexer, chunk_batch, metadata_batch):
+def _embed_texts(texts: list[str], workers: int = 1) -> np.ndarray:
     from mnemolet.cuore.embeddings.local_llm_embed import (
         embed_texts_batch,
     )
 
-    logger.info(f"Embedding batch of {len(chunk_batch)} chunks..")
-    for embeddings in embed_texts_batch(chunk_batch, batch_size=len(chunk_batch)):
-        indexer.store_embeddings(chunk_batch, embeddings, metadata_batch)
+    return np.vstack(
+        list(embed_texts_batch(texts, batch_size=len(texts), workers=workers))
+    )
+
+
+def _embed_batch(
+    dedup: ChunkDedup,
+    index: FileIndex,
+    chunk_batch: list[str],
+    metadata_batch: list[dict],
+    completed: list[str],
+) -> tuple:
+    """
+    Embed stage: attach embeddings to a batch of chunks,
+    chunks embedded before reuse their vectors.
+    """
+    embeddings = None
+    if chunk_batch:
+        logger.info(f"Embedding batch of {len(chunk_batch)} chunks..")
+        embeddings, chunk_hashes = dedup.embed(chunk_batch)
+        for m, chunk_hash in zip(metadata_batch, chunk_hashes):
+            m["chunk_hash"] = chunk_hash
+    index.set_state(completed, FileState.EMBEDDED)
+    return chunk_batch, embeddings, metadata_batch, completed
+
+
+def _store_batch(
+    indexer: QdrantIndexer,
+    dedup: ChunkDedup,
+    index: FileIndex,
+    chunk_batch: list[str],
+    embeddings: np.ndarray | None,
+    metadata_batch: list[dict],
+    completed: list[str],
+) -> None:
+    """
+    Store stage: upsert an embedded batch into Qdrant.
+    """
+    if chunk_batch:
+        point_ids = indexer.store_embeddings(chunk_batch, embeddings, metadata_batch)
+        dedup.record([m["chunk_hash"] for m in metadata_batch], point_ids)
         logger.info(f"Stored {len(chunk_batch)} chunks in Qdrant.")
+        # a file failing mid-way was purged, points in flight then go too
+        failed = index.failed_among({m["hash"] for m in metadata_batch})
+        if failed:
+            indexer.delete_files(failed)
+    index.set_state(completed, FileState.INDEXED)
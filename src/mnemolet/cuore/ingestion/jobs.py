@@ -0,0 +1,155 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from mnemolet.config import (
+    BATCH_SIZE,
+    QDRANT_COLLECTION,
+    QDRANT_URL,
+    SIZE_CHARS,
+    WORKERS,
+)
+from mnemolet.cuore.ingestion.walker import FileEntry
+from mnemolet.cuore.storage.job_store import JobStore
+from mnemolet.cuore.storage.models import JobState
+from mnemolet.cuore.utils.utils import file_stat
+
+logger = logging.getLogger(__name__)
+
+# seconds between progress writes (and cancel checks) of a running job
+PROGRESS_INTERVAL = 1.0
+# seconds an idle worker sleeps before looking for queued jobs again
+POLL_INTERVAL = 5.0
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """
+    Raised from the progress callback to stop a cancelled job.
+    """
+
+
+class IngestWorker(threading.Thread):
+    """
+    Daemon thread running queued ingest jobs one at a time.
+
+    Jobs live in SQLite (JobStore): jobs left running by a previous process
+    are queued again on start and resume their files. The embedding pool
+    is kept between jobs and stopped with the worker.
+    """
+
+    def __init__(
+        self,
+        store: JobStore | None = None,
+        ingest_fn: Callable[..., dict] | None = None,
+    ):
+        super().__init__(name="ingest-worker", daemon=True)
+        self.store = store or JobStore()
+        self._ingest_fn = ingest_fn
+        self._release_pool: Callable[[], None] | None = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def submit(
+        self, files: list[str], force: bool = False, resume: bool = False
+    ) -> int:
+        """
+        Queue files for ingestion and return the job ID, resume finishes
+        files an earlier run left incomplete.
+        """
+        job_id = self.store.create_job(files, force, resume)
+        self._wake.set()
+        return job_id
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+
+    def run(self) -> None:
+        self.store.requeue_running()
+        try:
+            while not self._stopping.is_set():
+                job = self.store.next_queued()
+                if job is None:
+                    self._wake.wait(POLL_INTERVAL)
+                    self._wake.clear()
+                    continue
+                self.run_job(job)
+        finally:
+            if self._release_pool is not None:
+                self._release_pool()
+
+    def run_job(self, job: dict) -> None:
+        """
+        Ingest the files of a claimed job and record how it ended.
+        """
+        job_id = job["id"]
+        logger.info(f"[JOB {job_id}] Ingesting {len(job['files'])} files")
+        last_report = 0.0
+
+        def report(progress: dict) -> None:
+            nonlocal last_report
+            now = time.monotonic()
+            if now - last_report < PROGRESS_INTERVAL:
+                return
+            last_report = now
+            self.store.update_progress(job_id, progress)
+            if self.store.cancel_requested(job_id):
+                raise JobCancelled
+
+        try:
+            result = self._ingest(job, report)
+        except JobCancelled:
+            logger.info(f"[JOB {job_id}] Cancelled")
+            self.store.finish(job_id, JobState.CANCELLED)
+        except Exception as e:
+            logger.exception(f"[JOB {job_id}] Failed")
+            self.store.finish(job_id, JobState.FAILED, error=str(e))
+        else:
+            logger.info(f"[JOB {job_id}] Done: {result['chunks']} chunks")
+            self.store.finish(job_id, JobState.DONE, progress=result)
+
+    def _ingest(self, job: dict, report: Callable[[dict], None]) -> dict:
+        if self._ingest_fn is None:
+            from mnemolet.cuore.embeddings.local_llm_embed import release_pool
+            from mnemolet.cuore.ingestion.ingest import ingest_files
+
+            self._ingest_fn = ingest_files
+            self._release_pool = release_pool
+
+        entries = []
+        for path in job["files"]:
+            try:
+                entries.append(FileEntry(Path(path), file_stat(os.stat(path))))
+            except OSError as e:
+                logger.warning(f"[JOB {job['id']}] Skipping {path}: {e}")
+
+        return self._ingest_fn(
+            entries,
+            BATCH_SIZE,
+            QDRANT_URL,
+            QDRANT_COLLECTION,
+            SIZE_CHARS,
+            force=job["force"],
+            workers=WORKERS,
+            resume=job["resume"],
+            progress=report,
+            keep_pool=True,
+        )
+
+
+def get_worker() -> IngestWorker:
+    """
+    Return the process-wide ingest worker, started on first use.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = IngestWorker()
+            _worker.start()
+        return _worker
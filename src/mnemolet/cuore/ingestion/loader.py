@@ -1,48 +1,375 @@
 import logging
-from collections.abc import Iterator
+import multiprocessing
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
 from pathlib import Path
 
-from mnemolet.cuore.ingestion.extractors.registry import get_extractor
-from mnemolet.cuore.storage.db_tracker import DBTracker
+from mnemolet.config import MAX_FILE_SIZE
+from mnemolet.cuore.ingestion.extractors.registry import (
+    get_extractor,
+    supported_extensions,
+)
+from mnemolet.cuore.ingestion.sandbox import ExtractionError, SandboxPool
+from mnemolet.cuore.ingestion.walker import FileEntry
+from mnemolet.cuore.storage.db_tracker import DBTracker, FileIndex
 from mnemolet.cuore.utils.utils import hash_file
 
 logger = logging.getLogger(__name__)
 
 
 def stream_files(
-    dir: Path, tracker: DBTracker, force: bool = False
+    files: Iterable[FileEntry],
+    tracker: DBTracker | FileIndex,
+    force: bool = False,
+    workers: int = 1,
+    verify: bool = False,
+    purge: Callable[[list[str]], None] | None = None,
+    sandbox: bool = False,
+    hashes: dict[str, str] | None = None,
 ) -> Iterator[dict[str, str, str]]:
     """
-    Yield files from a dir in chunks, skipping files already ingested.
+    Yield walked files in chunks, skipping files already ingested.
+
+    If a tracked path now has a different hash, purge is called with the
+    outdated hash (e.g. to delete its vectors) and the old record dropped,
+    so only the changed file is re-extracted. With force, tracked content
+    is purged before it is extracted again.
+
+    Files whose (size, mtime_ns, inode) match the tracker are skipped
+    without hashing, unless verify is set. hashes (path -> content hash)
+    are reused instead of hashing again, e.g. those of the transcript
+    warm-up. The hash is handed to the extractor.
+
+    Tracked files are prefetched once (pass a FileIndex to share it),
+    new records and state changes are written in batches.
+    Each file is tracked as discovered before extraction and marked
+    extracted once all of its parts were yielded, the final part of a file
+    has "last" set.
+
+    With workers > 1 hashing and extraction run in a process pool,
+    tracker writes stay in the calling process. With sandbox each file is
+    extracted by one of workers child processes under a timeout and memory
+    limit (see SandboxWorker). Either way a file's text is held in memory
+    whole, files with more than max_file_size chars of text fail.
+
+    Files failing extraction are tracked as failed with the reason and
+    skipped by later runs unless forced. If a file fails after some of its
+    parts were yielded, purge is called with its hash.
+    """
+    index = tracker if isinstance(tracker, FileIndex) else FileIndex(tracker)
+    try:
+        if workers > 1 or sandbox:
+            yield from _stream_files_parallel(
+                files, index, force, workers, verify, purge, sandbox, hashes or {}
+            )
+        else:
+            yield from _stream_files_serial(
+                files, index, force, verify, purge, hashes or {}
+            )
+    finally:
+        index.flush()
+
+
+def _stream_files_serial(
+    files: Iterable[FileEntry],
+    tracker: FileIndex,
+    force: bool,
+    verify: bool,
+    purge: Callable[[list[str]], None] | None,
+    hashes: dict[str, str],
+) -> Iterator[dict[str, str, str]]:
+    """
+    Hash and extract files one after another.
     """
-    for file_path in dir.rglob("*"):
-        extractor = get_extractor(file_path)
-        logger.debug(f" -> extractor: {extractor}")
-        if not extractor:
+    extensions = supported_extensions()
+    for file_path, stat in files:
+        if file_path.suffix.lower() not in extensions:
             continue
 
-        file_hash = hash_file(file_path)
+        resolved_path = str(file_path)
+
+        # Skip without reading the file if its stat snapshot is unchanged
+        if _is_unchanged(tracker, resolved_path, stat, force, verify):
+            logger.info(f"Skipping unchanged: {file_path}")
+            continue
+
+        file_hash = hashes.get(resolved_path) or hash_file(file_path)
+        _drop_stale(tracker, resolved_path, file_hash, purge)
+        _follow_move(tracker, resolved_path, file_hash, stat)
 
         # Skip if already ingested
-        if not force and tracker.file_exists(file_hash):
+        if _is_ingested(tracker, resolved_path, file_hash, stat, force):
             logger.info(f"Skipping already ingested: {file_path}")
             continue
+        _drop_forced(tracker, file_hash, force, purge)
 
+        tracker.add_file(resolved_path, file_hash, stat)
+        yielded = False
         try:
-            file_added = False
-            resolved_path = str(file_path.resolve())
-
-            for content_part in extractor.extract(file_path):
+            # built on first use, e.g. Whisper loads with the first audio file
+            extractor = get_extractor(file_path)
+            logger.debug(f" -> extractor: {extractor}")
+            for content_part, last in _flag_last(
+                extractor.extract(file_path, file_hash)
+            ):
                 logger.debug(f"[LOADER] Received part: len={len(content_part)}")
 
-                if not file_added:
-                    tracker.add_file(resolved_path, file_hash)
-                    file_added = True
-
+                yielded = True
                 yield {
                     "path": resolved_path,
                     "content": content_part,
                     "hash": file_hash,
+                    "last": last,
                 }
-        except Exception:
+        except Exception as e:
             logger.exception("Skipping %s", file_path)
+            tracker.mark_failed(file_hash, failure_reason(e))
+            # chunks of the parts yielded so far may be stored already
+            if yielded and purge is not None:
+                purge([file_hash])
+            continue
+
+        tracker.mark_extracted(file_hash)
+
+
+def failure_reason(e: Exception) -> str:
+    """
+    Reason recorded for a file failing extraction.
+    """
+    if isinstance(e, ExtractionError):
+        return str(e)
+    return f"{type(e).__name__}: {e}"
+
+
+def _flag_last(parts: Iterable[str]) -> Iterator[tuple[str, bool]]:
+    """
+    Yield (part, is_last) looking one part ahead.
+    """
+    parts = iter(parts)
+    prev = next(parts, None)
+    if prev is None:
+        return
+    for part in parts:
+        yield prev, False
+        prev = part
+    yield prev, True
+
+
+def _is_unchanged(
+    tracker: FileIndex,
+    path: str,
+    stat: tuple[int, int, int],
+    force: bool,
+    verify: bool,
+) -> bool:
+    """
+    Check if the file can be skipped without hashing it.
+    """
+    return not force and not verify and tracker.is_unchanged(path, stat)
+
+
+def _drop_stale(
+    tracker: FileIndex,
+    path: str,
+    file_hash: str,
+    purge: Callable[[list[str]], None] | None,
+) -> None:
+    """
+    Forget the previous version of a modified file.
+    """
+    old_hash = tracker.hash_for_path(path)
+    if old_hash is None or old_hash == file_hash:
+        return
+    logger.info(f"Content changed, dropping old version: {path}")
+    if purge is not None:
+        purge([old_hash])
+    tracker.remove_file(old_hash)
+
+
+def _follow_move(
+    tracker: FileIndex, path: str, file_hash: str, stat: tuple[int, int, int]
+) -> None:
+    """
+    Track known content found at a new path under that path if its old
+    path is gone (renamed or moved), so sync does not purge it.
+    """
+    old_path = tracker.path_for_hash(file_hash)
+    if old_path is None or old_path == path or os.path.exists(old_path):
+        return
+    logger.info(f"Moved: {old_path} -> {path}")
+    tracker.move_file(file_hash, path, stat)
+
+
+def _drop_forced(
+    tracker: FileIndex,
+    file_hash: str,
+    force: bool,
+    purge: Callable[[list[str]], None] | None,
+) -> None:
+    """
+    Purge the points of tracked content forced to be ingested again.
+    """
+    if force and purge is not None and tracker.is_tracked(file_hash):
+        purge([file_hash])
+
+
+def _is_ingested(
+    tracker: FileIndex,
+    path: str,
+    file_hash: str,
+    stat: tuple[int, int, int],
+    force: bool,
+) -> bool:
+    """
+    Check if file content is already ingested, refreshing its stat snapshot
+    (e.g. after a touch) so the next run can skip hashing it.
+    """
+    if force or not tracker.file_exists(file_hash):
+        return False
+    tracker.update_stat(path, file_hash, stat)
+    return True
+
+
+def _stream_files_parallel(
+    files: Iterable[FileEntry],
+    tracker: FileIndex,
+    force: bool,
+    workers: int,
+    verify: bool,
+    purge: Callable[[list[str]], None] | None,
+    sandbox: bool = False,
+    hashes: dict[str, str] | None = None,
+) -> Iterator[dict[str, str, str]]:
+    """
+    Hash and extract files in a process pool (or sandbox processes).
+
+    Parts of a file are yielded together once its extraction finishes,
+    files come back in completion order. Unlike the serial path, a file's
+    text is held in memory whole: up to workers * 2 files at a time, each
+    capped by max_file_size chars (see _extract_parts).
+    """
+    candidates = []
+    for file_path, stat in files:
+        resolved_path = str(file_path)
+        if _is_unchanged(tracker, resolved_path, stat, force, verify):
+            logger.info(f"Skipping unchanged: {file_path}")
+            continue
+        candidates.append((file_path, resolved_path, stat))
+
+    logger.info(f"[LOADER] Extracting {len(candidates)} files with {workers} workers")
+
+    # spawn: parent may already hold torch threads, fork is not safe then
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    extract = _extract_parts
+    executor = pool
+    if sandbox:
+        # one thread drives each sandbox process
+        sandboxes = SandboxPool(workers)
+        extract = sandboxes.extract
+        executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        to_extract = []
+        hashes = dict(hashes or {})
+        paths = [c[0] for c in candidates if c[1] not in hashes]
+        if workers > 1:
+            fresh = pool.map(hash_file, paths, chunksize=16)
+        else:
+            fresh = map(hash_file, paths)
+        hashes.update(zip(map(str, paths), fresh))
+        # same content twice in this run: extract the first copy only
+        queued = set()
+        for file_path, resolved_path, stat in candidates:
+            file_hash = hashes[resolved_path]
+            if file_hash in queued:
+                logger.info(f"Skipping duplicate content: {file_path}")
+                continue
+            _drop_stale(tracker, resolved_path, file_hash, purge)
+            _follow_move(tracker, resolved_path, file_hash, stat)
+            if _is_ingested(tracker, resolved_path, file_hash, stat, force):
+                logger.info(f"Skipping already ingested: {file_path}")
+                continue
+            _drop_forced(tracker, file_hash, force, purge)
+            queued.add(file_hash)
+            to_extract.append(((file_path, file_hash), resolved_path, stat))
+
+        # keep a couple of files per worker in flight to bound memory
+        for ((file_path, file_hash), resolved_path, stat), future in _submit_bounded(
+            executor, extract, to_extract, max_pending=workers * 2
+        ):
+            tracker.add_file(resolved_path, file_hash, stat)
+            try:
+                parts = future.result()
+            except Exception as e:
+                logger.error(f"Skipping {file_path}: {e}")
+                tracker.mark_failed(file_hash, failure_reason(e))
+                continue
+
+            for content_part, last in _flag_last(parts):
+                logger.debug(f"[LOADER] Received part: len={len(content_part)}")
+                yield {
+                    "path": resolved_path,
+                    "content": content_part,
+                    "hash": file_hash,
+                    "last": last,
+                }
+
+            tracker.mark_extracted(file_hash)
+    finally:
+        if sandbox:
+            executor.shutdown(wait=True, cancel_futures=True)
+            sandboxes.close()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _submit_bounded(
+    pool: Executor,
+    fn: Callable,
+    items: Iterable[tuple],
+    max_pending: int,
+) -> Iterator[tuple[tuple, Future]]:
+    """
+    Submit fn(*item[0]) for each item keeping at most max_pending in flight.
+    Yield (item, future) pairs as they complete.
+    """
+    items = iter(items)
+    pending = {pool.submit(fn, *item[0]): item for item in islice(items, max_pending)}
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = pending.pop(future)
+            nxt = next(items, None)
+            if nxt is not None:
+                pending[pool.submit(fn, *nxt[0])] = nxt
+            yield item, future
+
+
+def _extract_parts(
+    file_path: Path, file_hash: str | None = None, max_chars: int = MAX_FILE_SIZE
+) -> list[str]:
+    """
+    Worker: extract all text parts of a single file.
+
+    The parts are returned (and pickled) as a whole, not streamed, so the
+    text is capped at max_chars (0 = no limit), longer files fail.
+    """
+    extractor = get_extractor(file_path)
+    parts = []
+    size = 0
+    for part in extractor.extract(file_path, file_hash):
+        size += len(part)
+        if max_chars and size > max_chars:
+            raise ValueError(f"extracted text exceeds {max_chars} chars")
+        parts.append(part)
+    return parts
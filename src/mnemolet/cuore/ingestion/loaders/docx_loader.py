@@ -1,13 +1,19 @@
 from pathlib import Path
 from typing import Iterator
+from xml.etree.ElementTree import Element
 
-from docx import Document
+from mnemolet.cuore.ingestion.loaders.xml_stream import iter_paragraphs, join_parts
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
 
 
 def extract_docx(file: Path, chunk_size: int) -> Iterator[str]:
     """
     Yield text chunks from a DOCX.
 
+    Paragraphs are streamed from word/document.xml without loading the
+    whole document.
+
     Args:
         file: DOCX file path.
         chunk_size: size of text chunks to yield.
@@ -15,15 +21,22 @@ def extract_docx(file: Path, chunk_size: int) -> Iterator[str]:
     Yields:
         str: next chunk of text.
     """
-    docx = Document(file)
-
-    buffer = ""
+    paragraphs = iter_paragraphs(
+        file, "word/document.xml", f"{W}body", {f"{W}p"}, _paragraph_text
+    )
+    yield from join_parts(paragraphs, chunk_size)
 
-    for par in docx.paragraphs:
-        buffer += par.text + "\n"
-        while len(buffer) >= chunk_size:
-            yield buffer[:chunk_size]
-            buffer = buffer[chunk_size:]
 
-    if buffer:
-        yield buffer
+def _paragraph_text(p: Element) -> str:
+    """
+    Text of a w:p: text runs, tabs and line breaks, in document order.
+    """
+    out = []
+    for node in p.iter():
+        if node.tag == f"{W}t":
+            out.append(node.text or "")
+        elif node.tag == f"{W}tab":
+            out.append("\t")
+        elif node.tag in (f"{W}br", f"{W}cr"):
+            out.append("\n")
+    return "".join(out)
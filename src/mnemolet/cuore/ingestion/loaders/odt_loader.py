@@ -1,13 +1,20 @@
 from pathlib import Path
 from typing import Iterator
+from xml.etree.ElementTree import Element
 
-from odfdo import Document
+from mnemolet.cuore.ingestion.loaders.xml_stream import iter_paragraphs, join_parts
+
+OFFICE = "{urn:oasis:names:tc:opendocument:xmlns:office:1.0}"
+TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
 
 
 def extract_odt(file: Path, chunk_size: int) -> Iterator[str]:
     """
     Yield text chunks from a ODT.
 
+    Paragraphs and headings are streamed from content.xml without loading
+    the whole document.
+
     Args:
         file: ODT file path.
         chunk_size: size of text chunks to yield.
@@ -16,10 +23,28 @@ def extract_odt(file: Path, chunk_size: int) -> Iterator[str]:
         str: next chunk of text.
 
     Reference:
-        - ODFDO Recipies: https://jdum.github.io/odfdo/recipes.html
+        - OpenDocument text content: https://docs.oasis-open.org/office/OpenDocument/v1.3/
     """
-    odt = Document(file)
-    text = odt.get_formatted_text()
+    paragraphs = iter_paragraphs(
+        file, "content.xml", f"{OFFICE}text", {f"{TEXT}p", f"{TEXT}h"}, _node_text
+    )
+    yield from join_parts(paragraphs, chunk_size)
+
 
-    for i in range(0, len(text), chunk_size):
-        yield text[i : i + chunk_size]
+def _node_text(node: Element) -> str:
+    """
+    Text of a text:p/text:h including spans, links, spaces, tabs and breaks.
+    """
+    out = [node.text or ""]
+    for child in node:
+        if child.tag == f"{TEXT}s":
+            out.append(" " * int(child.get(f"{TEXT}c", "1")))
+        elif child.tag == f"{TEXT}tab":
+            out.append("\t")
+        elif child.tag == f"{TEXT}line-break":
+            out.append("\n")
+        else:
+            # span, a, ..., nested paragraphs were already emitted and cleared
+            out.append(_node_text(child))
+        out.append(child.tail or "")
+    return "".join(out)
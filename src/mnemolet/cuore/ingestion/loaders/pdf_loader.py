@@ -1,34 +1,179 @@
+import logging
+import math
+import multiprocessing
+import signal
+import threading
+from contextlib import contextmanager, nullcontext
+from multiprocessing.pool import Pool
 from pathlib import Path
-from typing import Iterator
+from typing import Callable, Iterable, Iterator
 
 from pypdf import PdfReader
 
+from mnemolet.config import PDF_PAGE_TIMEOUT, PDF_WORKERS
+from mnemolet.cuore.ingestion.extractors.base import TextPart
 
-def extract_pdf(file: Path, chunk_size: int) -> Iterator[str]:
+logger = logging.getLogger(__name__)
+
+# pages per worker task, small enough to balance, large enough that each
+# task amortizes opening the PDF
+MIN_PAGES_PER_TASK = 8
+
+
+def extract_pdf(
+    file: Path,
+    chunk_size: int,
+    workers: int = PDF_WORKERS,
+    page_timeout: float = PDF_PAGE_TIMEOUT,
+    get_pool: Callable[[], Pool] | None = None,
+) -> Iterator[TextPart]:
     """
     Yield text chunks from a PDF.
 
     Args:
         file: PDF file path.
         chunk_size: size of text chunks to yield.
+        workers: processes extracting page ranges in parallel, 1 = serial.
+            PDFs of a single page range are always extracted serially.
+        page_timeout: seconds before a page is skipped, 0 = no limit.
+        get_pool: returns a page_pool() shared across PDFs, without it
+            every PDF extracted in parallel starts its own.
 
     Yields:
-        str: next chunk of text from PDF.
+        TextPart: next chunk of text from PDF, whole pages of at least
+            chunk_size chars (less for the last one), marked with the
+            page numbers (1-based) where pages start.
     """
     reader = PdfReader(file)
-    text = ""
+    num_pages = len(reader.pages)
+
+    # a single range gains nothing from a pool; no nesting in a worker process
+    if (
+        workers > 1
+        and num_pages > MIN_PAGES_PER_TASK
+        and multiprocessing.parent_process() is None
+    ):
+        pool = get_pool() if get_pool is not None else None
+        pages = _extract_parallel(file, num_pages, workers, page_timeout, pool)
+    else:
+        pages = _iter_pages(reader, file, 0, num_pages, page_timeout)
+
+    yield from _buffer_pages(pages, chunk_size)
 
-    for page in reader.pages:
-        page_text = page.extract_text()
 
+def _buffer_pages(
+    pages: Iterable[tuple[int, str]], chunk_size: int
+) -> Iterator[TextPart]:
+    """
+    Collect pages until chunk_size chars, joining them once per part.
+    """
+    pieces = []
+    marks = []
+    size = 0
+
+    for page_no, page_text in pages:
         if not page_text:
             continue
+        marks.append((size, page_no))
+        pieces.append(page_text + "\n")
+        size += len(page_text) + 1
+
+        if size >= chunk_size:
+            yield TextPart("".join(pieces), "page", marks)
+            pieces, marks, size = [], [], 0
 
-        text += page_text + "\n"
+    if pieces:
+        yield TextPart("".join(pieces), "page", marks)
+
+
+def page_pool(workers: int) -> Pool:
+    """
+    Process pool for extracting PDF page ranges.
+    """
+    # spawn: parent may already hold torch threads, fork is not safe then
+    return multiprocessing.get_context("spawn").Pool(workers)
+
+
+def _extract_parallel(
+    file: Path,
+    num_pages: int,
+    workers: int,
+    page_timeout: float,
+    pool: Pool | None = None,
+) -> Iterator[tuple[int, str]]:
+    """
+    Extract page ranges in a process pool (a new one unless given), yield
+    pages in order.
+    """
+    per_task = max(MIN_PAGES_PER_TASK, math.ceil(num_pages / (workers * 4)))
+    tasks = [
+        (file, start, min(start + per_task, num_pages), page_timeout)
+        for start in range(0, num_pages, per_task)
+    ]
+    logger.info(
+        f"[PDF] {file}: {num_pages} pages in {len(tasks)} ranges, {workers} workers"
+    )
+
+    # a pool started here is terminated when the PDF is done
+    ctx = page_pool(min(workers, len(tasks))) if pool is None else nullcontext(pool)
+    with ctx as pool:
+        for pages in pool.imap(_extract_page_range, tasks):
+            yield from pages
+
+
+def _extract_page_range(
+    task: tuple[Path, int, int, float],
+) -> list[tuple[int, str]]:
+    """
+    Worker: extract text of pages [start, stop).
+    """
+    file, start, stop, page_timeout = task
+    return list(_iter_pages(PdfReader(file), file, start, stop, page_timeout))
+
+
+def _iter_pages(
+    reader: PdfReader, file: Path, start: int, stop: int, page_timeout: float
+) -> Iterator[tuple[int, str]]:
+    """
+    Yield (page number, text) of pages [start, stop), skipping pages that
+    fail or take longer than page_timeout.
+    """
+    for i in range(start, stop):
+        try:
+            with _time_limit(page_timeout):
+                page_text = reader.pages[i].extract_text()
+        except TimeoutError:
+            logger.warning(f"[PDF] {file}: page {i + 1} timed out, skipped")
+            continue
+        except Exception as e:
+            logger.warning(f"[PDF] {file}: page {i + 1} failed, skipped: {e}")
+            continue
+        yield i + 1, page_text
+
+
+@contextmanager
+def _time_limit(seconds: float):
+    """
+    Raise TimeoutError if the block runs longer than seconds.
+
+    Uses SIGALRM, so it is a no-op off the main thread or without SIGALRM.
+    """
+    usable = (
+        seconds > 0
+        and hasattr(signal, "SIGALRM")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if not usable:
+        yield
+        return
 
-        while len(text) >= chunk_size:
-            yield text[:chunk_size]
-            text = text[chunk_size:]
+    def _raise(signum, frame):
+        raise TimeoutError
 
-    if text:
-        yield text
+    previous = signal.signal(signal.SIGALRM, _raise)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
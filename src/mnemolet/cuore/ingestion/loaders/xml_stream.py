@@ -0,0 +1,73 @@
+import zipfile
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from xml.etree.ElementTree import Element, iterparse
+
+
+def iter_paragraphs(
+    file: Path,
+    member: str,
+    body_tag: str,
+    paragraph_tags: set[str],
+    paragraph_text: Callable[[Element], str],
+) -> Iterator[str]:
+    """
+    Stream paragraphs of an office document straight from its zip archive.
+
+    The XML member is decompressed and parsed incrementally, finished
+    top-level elements of the body are dropped, so memory stays flat
+    regardless of document size.
+
+    Args:
+        file: document path.
+        member: XML file inside the archive, e.g. "word/document.xml".
+        body_tag: qualified tag of the element holding the content.
+        paragraph_tags: qualified tags of paragraph-like elements.
+        paragraph_text: returns the text of a finished paragraph element.
+
+    Yields:
+        str: text of the next paragraph (nested ones come first).
+    """
+    with zipfile.ZipFile(file) as archive, archive.open(member) as xml:
+        body = None
+        depth = 0
+        body_depth = None
+
+        for event, elem in iterparse(xml, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if body is None and elem.tag == body_tag:
+                    body, body_depth = elem, depth
+                continue
+
+            if elem.tag in paragraph_tags:
+                yield paragraph_text(elem)
+                # keep the tail, it belongs to the enclosing paragraph
+                tail = elem.tail
+                elem.clear()
+                elem.tail = tail
+
+            if body is not None and depth == body_depth + 1:
+                # top-level element of the body is done, free it
+                del body[:]
+            depth -= 1
+
+
+def join_parts(paragraphs: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """
+    Join paragraphs into parts of at least chunk_size chars (less for the
+    last one), one line per paragraph. Each part is joined once.
+    """
+    pieces = []
+    size = 0
+
+    for text in paragraphs:
+        pieces.append(text + "\n")
+        size += len(text) + 1
+
+        if size >= chunk_size:
+            yield "".join(pieces)
+            pieces, size = [], 0
+
+    if pieces:
+        yield "".join(pieces)
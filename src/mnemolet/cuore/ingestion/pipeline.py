@@ -0,0 +1,135 @@
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class Stage(threading.Thread):
+    """
+    Pipeline stage: runs fn on items from inbox and passes results to outbox.
+
+    Time blocked on the queues is counted as wait, time spent in fn as busy.
+    After a failure the stage keeps draining its inbox, so upstream stages
+    never block on a full queue.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Any], Any],
+        inbox: queue.Queue,
+        outbox: queue.Queue | None,
+        aborted: threading.Event,
+    ):
+        super().__init__(name=f"ingest-{name}", daemon=True)
+        self.stage_name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.aborted = aborted
+        self.busy = 0.0
+        self.wait = 0.0
+        self.error: BaseException | None = None
+
+    def run(self):
+        while True:
+            start = time.perf_counter()
+            item = self.inbox.get()
+            self.wait += time.perf_counter() - start
+
+            if item is _DONE:
+                break
+            if self.error is not None or self.aborted.is_set():
+                continue
+
+            start = time.perf_counter()
+            try:
+                result = self.fn(item)
+            except BaseException as e:
+                logger.exception(f"[PIPELINE] Stage '{self.stage_name}' failed")
+                self.error = e
+                continue
+            finally:
+                self.busy += time.perf_counter() - start
+
+            if self.outbox is not None:
+                start = time.perf_counter()
+                self.outbox.put(result)
+                self.wait += time.perf_counter() - start
+
+        if self.outbox is not None:
+            self.outbox.put(_DONE)
+
+
+class Pipeline:
+    """
+    Chain of threaded stages connected by bounded queues.
+
+    The caller is the first stage: it feeds items with put(), which blocks
+    while the next queue is full (backpressure).
+
+    Usage:
+        with Pipeline([("embed", embed), ("store", store)], queue_size=4) as p:
+            for item in produce():
+                p.put(item)
+        p.timings()
+    """
+
+    def __init__(self, stages: list[tuple[str, Callable]], queue_size: int):
+        self.aborted = threading.Event()
+        self.wait = 0.0  # producer time blocked on put()
+        self._head = queue.Queue(maxsize=queue_size)
+        self._stages: list[Stage] = []
+
+        inbox = self._head
+        for i, (name, fn) in enumerate(stages):
+            last = i == len(stages) - 1
+            outbox = None if last else queue.Queue(maxsize=queue_size)
+            self._stages.append(Stage(name, fn, inbox, outbox, self.aborted))
+            inbox = outbox
+
+    def __enter__(self) -> "Pipeline":
+        for stage in self._stages:
+            stage.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            # stop doing work, just let the stages drain and exit
+            self.aborted.set()
+        self._head.put(_DONE)
+        for stage in self._stages:
+            stage.join()
+        if exc_type is None:
+            self._raise_if_failed()
+
+    def put(self, item: Any) -> None:
+        """
+        Feed an item to the first stage, blocking while its queue is full.
+        """
+        self._raise_if_failed()
+        start = time.perf_counter()
+        self._head.put(item)
+        self.wait += time.perf_counter() - start
+
+    def timings(self) -> dict[str, dict[str, float]]:
+        """
+        Return busy/wait seconds per stage.
+        """
+        return {
+            s.stage_name: {"busy": round(s.busy, 3), "wait": round(s.wait, 3)}
+            for s in self._stages
+        }
+
+    def _raise_if_failed(self) -> None:
+        for stage in self._stages:
+            if stage.error is not None:
+                raise RuntimeError(
+                    f"Ingest stage '{stage.stage_name}' failed: {stage.error}"
+                ) from stage.error
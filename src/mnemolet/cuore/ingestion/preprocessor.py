@@ -1,8 +1,20 @@
+import bisect
 import logging
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
 
+from mnemolet.config import EXCLUDE
+from mnemolet.cuore.ingestion.chunker import (
+    CharChunker,
+    Chunk,
+    Chunker,
+    StreamingChunker,
+)
+from mnemolet.cuore.ingestion.extractors.base import TextPart
+from mnemolet.cuore.ingestion.extractors.registry import supported_extensions
 from mnemolet.cuore.ingestion.loader import stream_files
-from mnemolet.cuore.storage.db_tracker import DBTracker
+from mnemolet.cuore.ingestion.walker import FileEntry, walk_files
+from mnemolet.cuore.storage.db_tracker import DBTracker, FileIndex
 
 logger = logging.getLogger(__name__)
 
@@ -42,14 +54,117 @@ def chunk_text(text: str, max_length: int = 3000) -> list[str]:
     return chunks
 
 
-def process_directory(dir: Path, tracker: DBTracker, force: bool, max_length: int):
+def process_directory(
+    dir: Path,
+    tracker: DBTracker,
+    force: bool,
+    max_length: int,
+    workers: int = 1,
+    verify: bool = False,
+    purge: Callable[[list[str]], None] | None = None,
+    chunker: Chunker | None = None,
+    sandbox: bool = False,
+):
     """
-    Combine file streaming and chunking.
+    Walk a directory with the configured excludes, stream and chunk its files.
     """
-    for data in stream_files(dir, tracker, force):
-        for chunk in chunk_text(data["content"], max_length=max_length):
-            yield {
-                "path": data["path"],
-                "chunk": chunk,
-                "hash": data["hash"],
-            }
+    files = walk_files(dir, supported_extensions(), exclude=EXCLUDE)
+    yield from process_files(
+        files, tracker, force, max_length, workers, verify, purge, chunker, sandbox
+    )
+
+
+def process_files(
+    files: Iterable[FileEntry],
+    tracker: DBTracker | FileIndex,
+    force: bool,
+    max_length: int,
+    workers: int = 1,
+    verify: bool = False,
+    purge: Callable[[list[str]], None] | None = None,
+    chunker: Chunker | None = None,
+    sandbox: bool = False,
+    hashes: dict[str, str] | None = None,
+):
+    """
+    Combine file streaming and chunking (see stream_files for hashes).
+
+    Parts of a file are chunked as one stream (text is carried across part
+    edges). Chunks carry their index within the file and [start, end) char
+    offsets in its extracted text, plus <key>_start/<key>_end for parts
+    with markers (e.g. page_start/page_end). Without a chunker, text is
+    split every max_length chars. Text still buffered when a file fails
+    mid-way is dropped.
+    """
+    stream = StreamingChunker(chunker or CharChunker(max_length))
+    pending = None  # a part of the file whose tail is still buffered
+    seq = 0  # index of the next chunk of the current file
+    marks = _Marks()
+    for data in stream_files(
+        files, tracker, force, workers, verify, purge, sandbox, hashes
+    ):
+        if pending is not None and data["hash"] != pending["hash"]:
+            # previous file failed mid-way, its buffered tail is dropped
+            stream.flush()
+            pending = None
+        if pending is None:
+            seq = 0
+            marks = _Marks()
+
+        marks.add(data["content"])
+        chunks = stream.feed(data["content"])
+        pending = data
+        if data["last"]:
+            # flushed before the file can be marked extracted
+            chunks += stream.flush()
+            pending = None
+        yield from _chunk_records(data, chunks, seq, marks)
+        seq += len(chunks)
+
+
+class _Marks:
+    """
+    Markers of the parts of one file (see TextPart), by file offset.
+    """
+
+    def __init__(self):
+        self._offsets: dict[str, list[int]] = {}
+        self._values: dict[str, list] = {}
+        self._size = 0
+
+    def add(self, part: str) -> None:
+        if isinstance(part, TextPart) and part.marks:
+            offsets = self._offsets.setdefault(part.key, [])
+            values = self._values.setdefault(part.key, [])
+            for offset, value in part.marks:
+                offsets.append(self._size + offset)
+                values.append(value)
+        self._size += len(part)
+
+    def span(self, start: int, end: int) -> dict:
+        """
+        Return marked values in effect at the first and last char of a span.
+        """
+        meta = {}
+        for key, offsets in self._offsets.items():
+            values = self._values[key]
+            first = max(bisect.bisect_right(offsets, start) - 1, 0)
+            last = max(bisect.bisect_right(offsets, max(end - 1, start)) - 1, 0)
+            meta[f"{key}_start"] = values[first]
+            meta[f"{key}_end"] = values[last]
+        return meta
+
+
+def _chunk_records(
+    data: dict, chunks: list[Chunk], seq: int, marks: _Marks
+) -> Iterator[dict]:
+    for i, chunk in enumerate(chunks, start=seq):
+        yield {
+            "path": data["path"],
+            "chunk": chunk.text,
+            "hash": data["hash"],
+            "index": i,
+            "start": chunk.start,
+            "end": chunk.end,
+            **marks.span(chunk.start, chunk.end),
+        }
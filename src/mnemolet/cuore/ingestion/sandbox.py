@@ -0,0 +1,159 @@
+import logging
+import multiprocessing
+import queue
+import time
+from pathlib import Path
+
+import psutil
+
+from mnemolet.config import EXTRACT_MAX_MEMORY, EXTRACT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# how often the parent checks the child while waiting, seconds
+POLL_INTERVAL = 0.1
+
+
+class ExtractionError(Exception):
+    """
+    A file could not be extracted, the message is the reason.
+    """
+
+
+class SandboxWorker:
+    """
+    Persistent child process extracting one file at a time.
+
+    The parent waits at most timeout seconds per file and kills the child
+    once its RSS exceeds max_memory bytes. A killed or crashed child is
+    replaced by a fresh one for the next file.
+    """
+
+    def __init__(
+        self, timeout: float = EXTRACT_TIMEOUT, max_memory: int = EXTRACT_MAX_MEMORY
+    ):
+        self.timeout = timeout
+        self.max_memory = max_memory
+        # spawn: parent may already hold torch threads, fork is not safe then
+        self._ctx = multiprocessing.get_context("spawn")
+        self._proc = None
+        self._conn = None
+
+    def extract(self, file: Path, file_hash: str | None = None) -> list[str]:
+        """
+        Extract all text parts of a file in the child process.
+
+        Raises:
+            ExtractionError: extractor failed, timed out, ran out of memory
+                or the child died.
+        """
+        if self._proc is None:
+            self._start()
+        self._conn.send((file, file_hash))
+
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        while not self._conn.poll(POLL_INTERVAL):
+            if not self._proc.is_alive():
+                code = self._proc.exitcode
+                self._stop()
+                raise ExtractionError(f"extraction process died (exit code {code})")
+            if deadline is not None and time.monotonic() > deadline:
+                self._stop()
+                raise ExtractionError(f"timed out after {self.timeout:g}s")
+            rss = self._rss()
+            if self.max_memory and rss > self.max_memory:
+                self._stop()
+                raise ExtractionError(
+                    f"exceeded memory limit ({rss >> 20} MB > "
+                    f"{self.max_memory >> 20} MB)"
+                )
+
+        try:
+            ok, result = self._conn.recv()
+        except EOFError:
+            code = self._proc.exitcode
+            self._stop()
+            raise ExtractionError(f"extraction process died (exit code {code})")
+        if not ok:
+            raise ExtractionError(result)
+        return result
+
+    def close(self) -> None:
+        """
+        Stop the child process.
+        """
+        if self._proc is None:
+            return
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._proc.join(timeout=1)
+        self._stop()
+
+    def _start(self) -> None:
+        self._conn, child_conn = self._ctx.Pipe()
+        self._proc = self._ctx.Process(
+            target=_sandbox_main, args=(child_conn,), daemon=True
+        )
+        self._proc.start()
+        child_conn.close()
+        logger.debug(f"[SANDBOX] Started extraction process {self._proc.pid}")
+
+    def _stop(self) -> None:
+        if self._proc.is_alive():
+            self._proc.kill()
+        self._proc.join()
+        self._conn.close()
+        self._proc = None
+        self._conn = None
+
+    def _rss(self) -> int:
+        try:
+            return psutil.Process(self._proc.pid).memory_info().rss
+        except psutil.Error:
+            return 0
+
+
+class SandboxPool:
+    """
+    Fixed set of SandboxWorkers shared by threads, one file per worker.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        timeout: float = EXTRACT_TIMEOUT,
+        max_memory: int = EXTRACT_MAX_MEMORY,
+    ):
+        self._workers = [SandboxWorker(timeout, max_memory) for _ in range(size)]
+        self._idle = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    def extract(self, file: Path, file_hash: str | None = None) -> list[str]:
+        worker = self._idle.get()
+        try:
+            return worker.extract(file, file_hash)
+        finally:
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.close()
+
+
+def _sandbox_main(conn) -> None:
+    """
+    Child: extract files sent by the parent until it sends None.
+    """
+    from mnemolet.cuore.ingestion.loader import _extract_parts, failure_reason
+
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        try:
+            conn.send((True, _extract_parts(*task)))
+        except Exception as e:
+            conn.send((False, failure_reason(e)))
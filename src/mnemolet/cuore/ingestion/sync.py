@@ -0,0 +1,58 @@
+import logging
+import os
+import time
+from pathlib import Path
+
+from mnemolet.config import DB_WRITE_BATCH, EXCLUDE
+from mnemolet.cuore.indexing.qdrant_indexer import QdrantIndexer
+from mnemolet.cuore.ingestion.walker import is_excluded
+from mnemolet.cuore.storage.db_tracker import DBTracker
+
+logger = logging.getLogger(__name__)
+
+
+def sync(
+    directory: str,
+    qdrant_url: str,
+    collection_name: str,
+    exclude: list[str] = EXCLUDE,
+    batch_size: int = DB_WRITE_BATCH,
+) -> dict:
+    """
+    Forget files under a directory that no longer exist on disk or are now
+    excluded from ingestion.
+    - streams tracked rows under the directory and checks each path,
+    - deletes points of gone files by hash payload, batch_size files per
+      call (moved files are tracked under their new path by ingest),
+    - removes their tracker rows.
+    """
+    start = time.perf_counter()
+    root = str(Path(directory).resolve())
+    # the filesystem root already ends with the separator
+    prefix = root if root.endswith(os.sep) else f"{root}{os.sep}"
+    exclude = list(exclude)
+
+    # rows are streamed, only the (few) gone ones are kept
+    tracker = DBTracker()
+    checked = 0
+    gone = []
+    for path, file_hash in tracker.iter_files(prefix=prefix):
+        checked += 1
+        rel = path[len(prefix) :].replace(os.sep, "/")
+        if is_excluded(rel, exclude) or not os.path.exists(path):
+            gone.append((path, file_hash))
+
+    indexer = QdrantIndexer(qdrant_url, collection_name)
+    has_collection = indexer.client.collection_exists(collection_name)
+    for i in range(0, len(gone), batch_size):
+        batch = gone[i : i + batch_size]
+        paths = [path for path, _ in batch]
+        if has_collection:
+            indexer.delete_files([file_hash for _, file_hash in batch])
+        tracker.remove_paths(paths)
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"[SYNC] Checked {checked} tracked files, removed {len(gone)} in {elapsed:.2f}s"
+    )
+    return {"checked": checked, "removed": len(gone), "time": elapsed}
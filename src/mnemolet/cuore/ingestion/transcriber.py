@@ -0,0 +1,142 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from mnemolet.config import (
+    AUDIO_BATCH_SIZE,
+    AUDIO_CPU_THREADS,
+    AUDIO_LANGUAGE,
+    AUDIO_MODEL,
+    TRANSCRIPT_DIR,
+)
+from mnemolet.cuore.ingestion.extractors.audio_extractor import (
+    AudioExtractor,
+    load_whisper,
+    transcribe,
+)
+from mnemolet.cuore.ingestion.transcripts import TranscriptCache
+
+logger = logging.getLogger(__name__)
+
+# per worker process: (pipeline, language, batch_size, cache)
+_worker = None
+
+
+def audio_duration(file: Path) -> float:
+    """
+    Return duration of an audio file in seconds from its container header,
+    0 if unknown.
+    """
+    import av
+
+    try:
+        with av.open(str(file)) as container:
+            if container.duration is not None:
+                return container.duration / av.time_base
+    except Exception as e:
+        logger.warning(f"[audio] Cannot read duration of {file}: {e}")
+    return 0.0
+
+
+def transcribe_files(
+    files: list[tuple[Path, str]],
+    workers: int,
+    cpu_threads: int = AUDIO_CPU_THREADS,
+    batch_size: int = AUDIO_BATCH_SIZE,
+    model_size: str = AUDIO_MODEL,
+    language: str = AUDIO_LANGUAGE,
+    cache_dir: Path = TRANSCRIPT_DIR,
+) -> dict:
+    """
+    Transcribe audio files with a pool of Whisper processes into the
+    transcript cache, AudioExtractor then reads them from there.
+
+    - files are (path, file hash), already cached ones are skipped,
+    - longest files go first so workers finish at about the same time,
+    - cpu_threads (0 = all cores) are split between the workers.
+
+    Returns:
+        files, audio seconds, wall seconds and audio seconds per wall second.
+    """
+    language = language or None
+    cache = TranscriptCache(cache_dir)
+    todo = [
+        (path, file_hash)
+        for path, file_hash in files
+        if not cache.path(file_hash, model_size, language).exists()
+    ]
+    if not todo:
+        return {"files": 0, "audio": 0.0, "time": 0.0, "speed": 0.0}
+
+    start = time.perf_counter()
+    durations = {path: audio_duration(path) for path, _ in todo}
+    todo.sort(key=lambda item: durations[item[0]], reverse=True)
+
+    workers = min(workers, len(todo))
+    threads = max(1, (cpu_threads or os.cpu_count() or 1) // workers)
+    logger.info(
+        f"[audio] Transcribing {len(todo)} files "
+        f"({sum(durations.values()):.0f}s of audio) "
+        f"with {workers} workers x {threads} threads"
+    )
+
+    done_audio = 0.0
+    done_files = 0
+    # spawn: parent may already hold torch threads, fork is not safe then
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_size, threads, language, batch_size, cache_dir),
+    ) as pool:
+        futures = {
+            pool.submit(_transcribe_file, path, file_hash): path
+            for path, file_hash in todo
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                future.result()
+            except Exception:
+                # left uncached, the extractor retries it
+                logger.exception(f"[audio] Transcription failed: {path}")
+                continue
+            done_files += 1
+            done_audio += durations[path]
+
+    elapsed = time.perf_counter() - start
+    speed = done_audio / elapsed if elapsed else 0.0
+    logger.info(
+        f"[audio] Transcribed {done_files} files, {done_audio:.0f}s of audio "
+        f"in {elapsed:.1f}s ({speed:.1f} audio-s/s)"
+    )
+    return {"files": done_files, "audio": done_audio, "time": elapsed, "speed": speed}
+
+
+def is_audio(path: Path) -> bool:
+    return path.suffix.lower() in AudioExtractor.extensions
+
+
+def _init_worker(
+    model_size: str,
+    cpu_threads: int,
+    language: str | None,
+    batch_size: int,
+    cache_dir: Path,
+) -> None:
+    global _worker
+    _, pipeline = load_whisper(model_size, cpu_threads=cpu_threads)
+    _worker = (pipeline, model_size, language, batch_size, TranscriptCache(cache_dir))
+
+
+def _transcribe_file(path: Path, file_hash: str) -> None:
+    """
+    Worker: transcribe one file into the cache.
+    """
+    pipeline, model_size, language, batch_size, cache = _worker
+    segments = transcribe(pipeline, path, language, batch_size)
+    for _ in cache.put(file_hash, model_size, language, segments):
+        pass
@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from mnemolet.config import TRANSCRIPT_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class Segment(NamedTuple):
+    """
+    Transcribed span of audio, times in seconds.
+    """
+
+    start: float
+    end: float
+    text: str
+
+
+class TranscriptCache:
+    """
+    On-disk transcripts keyed by audio file hash, model size and language.
+
+    One JSON-lines file of segments per key. A transcript is only published
+    (atomic rename) once the whole file was transcribed, so an interrupted
+    run never leaves a truncated cache entry.
+    """
+
+    def __init__(self, cache_dir: Path = TRANSCRIPT_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def path(self, file_hash: str, model_size: str, language: str | None) -> Path:
+        name = f"{file_hash}-{model_size}-{language or 'auto'}.jsonl"
+        return self.cache_dir / file_hash[:2] / name
+
+    def get(
+        self, file_hash: str, model_size: str, language: str | None
+    ) -> Iterator[Segment] | None:
+        """
+        Return cached segments, or None on a miss.
+        """
+        path = self.path(file_hash, model_size, language)
+        if not path.exists():
+            return None
+        logger.info(f"[audio] Transcript cache hit: {path.name}")
+        return self._read(path)
+
+    def put(
+        self,
+        file_hash: str,
+        model_size: str,
+        language: str | None,
+        segments: Iterable[Segment],
+    ) -> Iterator[Segment]:
+        """
+        Pass segments through while writing them to the cache.
+        """
+        path = self.path(file_hash, model_size, language)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".part")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for segment in segments:
+                    f.write(json.dumps(segment._asdict(), ensure_ascii=False) + "\n")
+                    yield segment
+            os.replace(tmp, path)
+            logger.info(f"[audio] Cached transcript: {path.name}")
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    @staticmethod
+    def _read(path: Path) -> Iterator[Segment]:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                yield Segment(**json.loads(line))
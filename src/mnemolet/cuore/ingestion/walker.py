@@ -0,0 +1,124 @@
+import fnmatch
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from mnemolet.cuore.utils.utils import file_stat
+
+logger = logging.getLogger(__name__)
+
+
+class FileEntry(NamedTuple):
+    """
+    File found by the walker.
+
+    path: absolute path of the file
+    stat: (size, mtime_ns, inode) taken during the walk
+    """
+
+    path: Path
+    stat: tuple[int, int, int]
+
+
+def walk_files(
+    root: Path,
+    extensions: set[str],
+    include: Iterable[str] = (),
+    exclude: Iterable[str] = (),
+    max_file_size: int = 0,
+    follow_symlinks: bool = False,
+) -> Iterator[FileEntry]:
+    """
+    Walk a directory once with os.scandir and yield supported files.
+
+    Args:
+        root: directory to walk.
+        extensions: lower-case suffixes to keep, checked before any stat.
+        include: glob patterns a file must match (name or relative path),
+            empty means everything.
+        exclude: glob patterns for files and directories to skip,
+            excluded directories are not descended into.
+        max_file_size: skip files larger than this many bytes, 0 = no limit.
+        follow_symlinks: follow symlinked files and directories.
+
+    Yields:
+        FileEntry for every matching file.
+    """
+    include = list(include)
+    exclude = list(exclude)
+    root = Path(root).resolve()
+
+    # guards against symlink loops when following links
+    seen_dirs: set[tuple[int, int]] = set()
+    stack = [(str(root), "")]
+
+    while stack:
+        dir_path, rel_dir = stack.pop()
+
+        if follow_symlinks:
+            st = os.stat(dir_path)
+            if (st.st_dev, st.st_ino) in seen_dirs:
+                continue
+            seen_dirs.add((st.st_dev, st.st_ino))
+
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError as e:
+            logger.warning(f"[WALK] Cannot read {dir_path}: {e}")
+            continue
+
+        for entry in entries:
+            rel = f"{rel_dir}{entry.name}"
+
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    if not _matches(entry.name, rel, exclude):
+                        stack.append((entry.path, f"{rel}/"))
+                    continue
+
+                if not entry.is_file(follow_symlinks=follow_symlinks):
+                    continue
+
+                # cheap checks first, stat only files that can be ingested
+                if os.path.splitext(entry.name)[1].lower() not in extensions:
+                    continue
+                if _matches(entry.name, rel, exclude):
+                    continue
+                if include and not _matches(entry.name, rel, include):
+                    continue
+
+                st = entry.stat(follow_symlinks=follow_symlinks)
+            except OSError as e:
+                logger.warning(f"[WALK] Cannot stat {entry.path}: {e}")
+                continue
+
+            if max_file_size and st.st_size > max_file_size:
+                logger.info(f"[WALK] Skipping {rel}: {st.st_size} bytes")
+                continue
+
+            yield FileEntry(Path(entry.path), file_stat(st))
+
+
+def is_excluded(rel: str, exclude: Iterable[str]) -> bool:
+    """
+    Check if walk_files would skip a file given by its "/"-separated path
+    relative to the root, itself or one of its directories being excluded.
+    """
+    exclude = list(exclude)
+    parts = rel.split("/")
+    return any(
+        _matches(part, "/".join(parts[: i + 1]), exclude)
+        for i, part in enumerate(parts)
+    )
+
+
+def _matches(name: str, rel: str, patterns: list[str]) -> bool:
+    """
+    Check if a file name or its relative path matches any glob pattern.
+    """
+    return any(
+        fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel, pattern)
+        for pattern in patterns
+    )
@@ -26,10 +26,10 @@ class Retriever:
         Retrieve and filter context chunks from Qdrant.
         """
         try:
-            from mnemolet.cuore.embeddings.local_llm_embed import _get_model
+            from mnemolet.cuore.embeddings.query_batcher import get_query_batcher
 
-            model = _get_model()
-            query_vector = model.encode(query).tolist()
+            # concurrent requests share one forward pass
+            query_vector = get_query_batcher().embed(query).tolist()
 
             results = self._client.query_points(
                 collection_name=self.cfg.collection_name,
@@ -2,7 +2,7 @@ import logging
 from pathlib import Path
 from typing import Optional
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import Session, sessionmaker
 
 from mnemolet.config import DB_PATH
@@ -41,6 +41,7 @@ class BaseDatabaseManager:
 
         self._configure_sqlite()
         self._create_tables()
+        self._add_missing_columns()
 
     def _configure_sqlite(self) -> None:
         """Configure SQLite PRAGMAs for WAL mode and foreign keys."""
@@ -60,6 +61,38 @@ class BaseDatabaseManager:
             f"[{self.__class__.__name__}] Tables created/verified at {self.db_path}"
         )
 
+    def _add_missing_columns(self) -> None:
+        """
+        Add columns introduced after a table was created.
+
+        create_all() never alters existing tables, new columns must be
+        nullable or have a server default.
+        """
+        inspector = inspect(self.engine)
+        existing_tables = set(inspector.get_table_names())
+
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                if table.name not in existing_tables:
+                    continue
+                present = {c["name"] for c in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in present:
+                        continue
+                    col_type = column.type.compile(dialect=self.engine.dialect)
+                    ddl = (
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"
+                    )
+                    if column.server_default is not None:
+                        default = column.server_default.arg
+                        if isinstance(default, str):
+                            default = f"'{default}'"
+                        if not column.nullable:
+                            ddl += " NOT NULL"
+                        ddl += f" DEFAULT {default}"
+                    conn.execute(text(ddl))
+                    logger.info(f"Added column {table.name}.{column.name}")
+
     def get_session(self) -> Session:
         """Get a new database session."""
         return self.SessionLocal()
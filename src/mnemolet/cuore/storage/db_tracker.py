@@ -1,27 +1,43 @@
 import logging
+import threading
+from collections.abc import Iterable, Iterator
 from datetime import UTC, datetime
 from typing import Optional
 
 from sqlalchemy import (
+    bindparam,
+    delete,
     select,
+    update,
 )
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.exc import SQLAlchemyError
 
+from mnemolet.config import DB_WRITE_BATCH
 from mnemolet.cuore.storage.base_db import BaseDatabaseManager
-from mnemolet.cuore.storage.models import FileRecord
+from mnemolet.cuore.storage.models import ChunkRecord, FileRecord, FileState
 
 logger = logging.getLogger(__name__)
 
 
 class DBTracker(BaseDatabaseManager):
-    def add_file(self, path: str, file_hash: str) -> None:
+    def add_file(
+        self,
+        path: str,
+        file_hash: str,
+        stat: Optional[tuple[int, int, int]] = None,
+        state: FileState = FileState.DISCOVERED,
+    ) -> None:
         """
         Insert a new file if it does not exist.
 
         Args:
             path: File path
             file_hash: File hash
+            stat: Optional (size, mtime_ns, inode) snapshot of the file
+            state: Initial ingestion state
         """
+        size, mtime_ns, inode = stat or (None, None, None)
         with self.get_session() as session:
             try:
                 # Check if file already exists by hash
@@ -35,7 +51,11 @@ class DBTracker(BaseDatabaseManager):
                         path=path,
                         hash=file_hash,
                         ingested_at=datetime.now(UTC),
-                        indexed=False,
+                        indexed=state == FileState.INDEXED,
+                        state=state,
+                        size=size,
+                        mtime_ns=mtime_ns,
+                        inode=inode,
                     )
                     session.add(file_record)
                     session.commit()
@@ -70,6 +90,299 @@ class DBTracker(BaseDatabaseManager):
                 logger.error(f"Error checking file existence {file_hash}: {e}")
                 return False
 
+    def is_indexed(self, file_hash: str) -> bool:
+        """
+        Check if file with this hash was fully ingested.
+
+        Args:
+            file_hash: File hash to check
+
+        Returns:
+            True if the file reached the indexed state, False otherwise
+        """
+        with self.get_session() as session:
+            try:
+                state = session.execute(
+                    select(FileRecord.state).where(FileRecord.hash == file_hash)
+                ).scalar_one_or_none()
+                return state == FileState.INDEXED
+            except SQLAlchemyError as e:
+                logger.error(f"Error checking file state {file_hash}: {e}")
+                return False
+
+    def add_files(self, records: list[dict]) -> None:
+        """
+        Insert many files in a single transaction, ignoring known ones.
+
+        Args:
+            records: dicts with path, hash, state and optional
+                size, mtime_ns, inode, error
+        """
+        if not records:
+            return
+        now = datetime.now(UTC)
+        rows = [
+            {
+                "path": r["path"],
+                "hash": r["hash"],
+                "ingested_at": now,
+                "indexed": r["state"] == FileState.INDEXED,
+                "state": r["state"],
+                "size": r.get("size"),
+                "mtime_ns": r.get("mtime_ns"),
+                "inode": r.get("inode"),
+                "error": r.get("error"),
+            }
+            for r in records
+        ]
+        with self.get_session() as session:
+            try:
+                session.execute(insert(FileRecord).on_conflict_do_nothing(), rows)
+                session.commit()
+                logger.debug(f"Added {len(rows)} files")
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error adding {len(rows)} files: {e}")
+                raise
+
+    def known_hashes(self) -> dict[str, str]:
+        """
+        Return hash -> path of all tracked files in one query.
+        """
+        with self.get_session() as session:
+            try:
+                rows = session.execute(select(FileRecord.hash, FileRecord.path))
+                return {file_hash: path for file_hash, path in rows}
+            except SQLAlchemyError as e:
+                logger.error(f"Error loading known hashes: {e}")
+                return {}
+
+    def incomplete_files(self) -> dict[str, str]:
+        """
+        Return hash -> path of files whose ingestion did not reach indexed,
+        except failed ones.
+        """
+        with self.get_session() as session:
+            try:
+                rows = session.execute(
+                    select(FileRecord.hash, FileRecord.path).where(
+                        FileRecord.state.not_in([FileState.INDEXED, FileState.FAILED])
+                    )
+                )
+                return {file_hash: path for file_hash, path in rows}
+            except SQLAlchemyError as e:
+                logger.error(f"Error loading incomplete files: {e}")
+                return {}
+
+    def iter_files(
+        self, prefix: Optional[str] = None, batch_size: int = DB_WRITE_BATCH
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Stream (path, hash) of tracked files without building ORM objects.
+
+        Args:
+            prefix: only files whose path starts with it
+            batch_size: rows fetched per round trip
+        """
+        query = select(FileRecord.path, FileRecord.hash)
+        if prefix is not None:
+            query = query.where(FileRecord.path.startswith(prefix, autoescape=True))
+        with self.get_session() as session:
+            try:
+                rows = session.execute(query.execution_options(yield_per=batch_size))
+                for path, file_hash in rows:
+                    yield path, file_hash
+            except SQLAlchemyError as e:
+                logger.error(f"Error iterating tracked files: {e}")
+                raise
+
+    def stat_snapshots(self) -> dict[str, tuple[int, int, int]]:
+        """
+        Return path -> (size, mtime_ns, inode) of all tracked files in one query.
+        """
+        with self.get_session() as session:
+            try:
+                rows = session.execute(
+                    select(
+                        FileRecord.path,
+                        FileRecord.size,
+                        FileRecord.mtime_ns,
+                        FileRecord.inode,
+                    ).where(FileRecord.size.is_not(None))
+                )
+                return {path: (size, mtime, inode) for path, size, mtime, inode in rows}
+            except SQLAlchemyError as e:
+                logger.error(f"Error loading stat snapshots: {e}")
+                return {}
+
+    def is_unchanged(self, path: str, stat: tuple[int, int, int]) -> bool:
+        """
+        Check if file at path is tracked with the same stat snapshot.
+
+        Args:
+            path: File path
+            stat: (size, mtime_ns, inode) of the file on disk
+
+        Returns:
+            True if size, mtime and inode all match the tracked record
+        """
+        size, mtime_ns, inode = stat
+        with self.get_session() as session:
+            try:
+                result = session.execute(
+                    select(FileRecord.id).where(
+                        FileRecord.path == path,
+                        FileRecord.size == size,
+                        FileRecord.mtime_ns == mtime_ns,
+                        FileRecord.inode == inode,
+                    )
+                ).scalar_one_or_none()
+                return result is not None
+            except SQLAlchemyError as e:
+                logger.error(f"Error checking file stat {path}: {e}")
+                return False
+
+    def update_stat(
+        self, path: str, file_hash: str, stat: tuple[int, int, int]
+    ) -> None:
+        """
+        Refresh stat snapshot of a tracked file whose content is unchanged.
+
+        Args:
+            path: File path
+            file_hash: File hash, must match the tracked record
+            stat: (size, mtime_ns, inode) of the file on disk
+        """
+        size, mtime_ns, inode = stat
+        with self.get_session() as session:
+            try:
+                session.execute(
+                    update(FileRecord)
+                    .where(FileRecord.path == path, FileRecord.hash == file_hash)
+                    .values(size=size, mtime_ns=mtime_ns, inode=inode)
+                )
+                session.commit()
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error updating file stat {path}: {e}")
+                raise
+
+    def update_stats(self, records: list[dict]) -> None:
+        """
+        Refresh stat snapshots of many files in a single transaction, a
+        file tracked under another path (moved) takes the given path.
+
+        Args:
+            records: dicts with path, hash, size, mtime_ns and inode
+        """
+        if not records:
+            return
+        table = FileRecord.__table__
+        stmt = (
+            update(table)
+            .where(table.c.hash == bindparam("b_hash"))
+            .values(
+                path=bindparam("b_path"),
+                size=bindparam("size"),
+                mtime_ns=bindparam("mtime_ns"),
+                inode=bindparam("inode"),
+            )
+        )
+        rows = [
+            {
+                "b_path": r["path"],
+                "b_hash": r["hash"],
+                "size": r["size"],
+                "mtime_ns": r["mtime_ns"],
+                "inode": r["inode"],
+            }
+            for r in records
+        ]
+        with self.get_session() as session:
+            try:
+                session.connection().execute(stmt, rows)
+                session.commit()
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error updating {len(rows)} file stats: {e}")
+                raise
+
+    def remove_files(self, hashes: list[str]) -> None:
+        """
+        Delete many files from the tracker in a single transaction.
+
+        Args:
+            hashes: hashes of the files to forget
+        """
+        if not hashes:
+            return
+        with self.get_session() as session:
+            try:
+                session.execute(delete(FileRecord).where(FileRecord.hash.in_(hashes)))
+                session.commit()
+                logger.debug(f"Removed {len(hashes)} files")
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error removing {len(hashes)} files: {e}")
+                raise
+
+    def remove_paths(self, paths: list[str]) -> None:
+        """
+        Delete the files tracked under paths in a single transaction.
+        """
+        if not paths:
+            return
+        with self.get_session() as session:
+            try:
+                session.execute(delete(FileRecord).where(FileRecord.path.in_(paths)))
+                session.commit()
+                logger.debug(f"Removed {len(paths)} paths")
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error removing {len(paths)} paths: {e}")
+                raise
+
+    def set_states(
+        self, states: dict[str, FileState], errors: Optional[dict[str, str]] = None
+    ) -> None:
+        """
+        Move many files to a new ingestion state in a single transaction.
+
+        Args:
+            states: file hash -> new state
+            errors: file hash -> failure reason, cleared for other files
+        """
+        if not states:
+            return
+        errors = errors or {}
+        table = FileRecord.__table__
+        stmt = (
+            update(table)
+            .where(table.c.hash == bindparam("b_hash"))
+            .values(
+                state=bindparam("state"),
+                indexed=bindparam("indexed"),
+                error=bindparam("error"),
+            )
+        )
+        rows = [
+            {
+                "b_hash": h,
+                "state": state,
+                "indexed": state == FileState.INDEXED,
+                "error": errors.get(h),
+            }
+            for h, state in states.items()
+        ]
+        with self.get_session() as session:
+            try:
+                session.connection().execute(stmt, rows)
+                session.commit()
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error updating state of {len(rows)} files: {e}")
+                raise
+
     def mark_indexed(self, file_hash: str) -> None:
         """
         Mark file as indexed in Qdrant.
@@ -85,6 +398,7 @@ class DBTracker(BaseDatabaseManager):
 
                 if result:
                     result.indexed = True
+                    result.state = FileState.INDEXED
                     session.commit()
                     logger.debug(f"Marked file as indexed: {file_hash}")
                 else:
@@ -95,6 +409,61 @@ class DBTracker(BaseDatabaseManager):
                 logger.error(f"Error marking file as indexed {file_hash}: {e}")
                 raise
 
+    def chunk_points(self, hashes: list[str]) -> dict[str, str]:
+        """
+        Return chunk hash -> point id for the known chunks among hashes.
+        """
+        if not hashes:
+            return {}
+        with self.get_session() as session:
+            try:
+                rows = session.execute(
+                    select(ChunkRecord.hash, ChunkRecord.point_id).where(
+                        ChunkRecord.hash.in_(hashes)
+                    )
+                )
+                return {chunk_hash: point_id for chunk_hash, point_id in rows}
+            except SQLAlchemyError as e:
+                logger.error(f"Error loading chunk points: {e}")
+                return {}
+
+    def add_chunks(self, points: dict[str, str]) -> None:
+        """
+        Record the point holding the vector of each chunk, replacing older ones.
+
+        Args:
+            points: chunk hash -> point id
+        """
+        if not points:
+            return
+        rows = [{"hash": h, "point_id": p} for h, p in points.items()]
+        stmt = insert(ChunkRecord)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChunkRecord.hash],
+            set_={"point_id": stmt.excluded.point_id},
+        )
+        with self.get_session() as session:
+            try:
+                session.execute(stmt, rows)
+                session.commit()
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error adding {len(rows)} chunks: {e}")
+                raise
+
+    def clear_chunks(self) -> None:
+        """
+        Forget all chunk -> point mappings (e.g. collection was recreated).
+        """
+        with self.get_session() as session:
+            try:
+                session.execute(delete(ChunkRecord))
+                session.commit()
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error clearing chunks: {e}")
+                raise
+
     def list_files(self, indexed: Optional[bool] = None) -> list[dict]:
         """
         List all tracked files, optionally filtered by indexed status.
@@ -119,6 +488,8 @@ class DBTracker(BaseDatabaseManager):
                         "hash": record.hash,
                         "ingested_at": record.ingested_at.isoformat(),
                         "indexed": record.indexed,
+                        "state": record.state,
+                        "error": record.error,
                     }
                     for record in results
                 ]
@@ -126,3 +497,262 @@ class DBTracker(BaseDatabaseManager):
             except SQLAlchemyError as e:
                 logger.error(f"Error listing files: {e}")
                 return []
+
+
+class FileIndex:
+    """
+    In-memory view of tracked files for a single ingest run.
+
+    Known hashes and stat snapshots are loaded once, new files, stat
+    refreshes and state changes are buffered and written in one
+    transaction per write_batch changes. Call flush() when done.
+
+    Files that never reached the indexed state count as known, unless
+    resume is set: then they are reported as new so they get re-ingested.
+    Given paths, only incomplete files at those paths are considered, e.g.
+    the files of this run, others may belong to another run in progress.
+
+    Safe to share between the loader and the pipeline stage threads.
+    """
+
+    def __init__(
+        self,
+        tracker: DBTracker,
+        write_batch: int = DB_WRITE_BATCH,
+        resume: bool = False,
+        paths: Optional[Iterable[str]] = None,
+    ):
+        self.tracker = tracker
+        self.write_batch = write_batch
+        self._lock = threading.RLock()
+        self._paths = tracker.known_hashes()
+        self._hashes = {path: file_hash for file_hash, path in self._paths.items()}
+        self._stats = tracker.stat_snapshots()
+        self.incomplete = tracker.incomplete_files()
+        if paths is not None:
+            paths = set(paths)
+            self.incomplete = {
+                h: path for h, path in self.incomplete.items() if path in paths
+            }
+        self._retry = dict(self.incomplete) if resume else {}
+        self._retry_paths = set(self._retry.values())
+        self._removed: list[str] = []
+        self._new: dict[str, dict] = {}
+        self._stat_updates: list[dict] = []
+        self._states: dict[str, FileState] = {}
+        self._errors: dict[str, str] = {}
+        self.failed = 0  # files failed during this run
+        self._failed: set[str] = set()
+        self._extracted: list[str] = []
+        logger.info(
+            f"Loaded {len(self._paths)} tracked files, "
+            f"{len(self.incomplete)} incomplete"
+        )
+
+    def file_exists(self, file_hash: str) -> bool:
+        with self._lock:
+            return file_hash in self._paths and file_hash not in self._retry
+
+    def is_tracked(self, file_hash: str) -> bool:
+        """
+        Check if content is tracked, whatever its state.
+        """
+        with self._lock:
+            return file_hash in self._paths
+
+    def is_unchanged(self, path: str, stat: tuple[int, int, int]) -> bool:
+        with self._lock:
+            return path not in self._retry_paths and self._stats.get(path) == stat
+
+    def add_file(
+        self,
+        path: str,
+        file_hash: str,
+        stat: Optional[tuple[int, int, int]] = None,
+    ) -> None:
+        """
+        Track a file about to be extracted, known files restart as discovered.
+        """
+        with self._lock:
+            if file_hash in self._paths:
+                self._retry.pop(file_hash, None)
+                self._set_state(file_hash, FileState.DISCOVERED)
+                return
+            size, mtime_ns, inode = stat or (None, None, None)
+            self._paths[file_hash] = path
+            self._hashes[path] = file_hash
+            if stat is not None:
+                self._stats[path] = stat
+            self._new[file_hash] = {
+                "path": path,
+                "hash": file_hash,
+                "state": FileState.DISCOVERED,
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "inode": inode,
+            }
+            self._maybe_flush()
+
+    def hash_for_path(self, path: str) -> Optional[str]:
+        """
+        Return hash tracked for path, if any.
+        """
+        with self._lock:
+            return self._hashes.get(path)
+
+    def path_for_hash(self, file_hash: str) -> Optional[str]:
+        """
+        Return path tracked for hash, if any.
+        """
+        with self._lock:
+            return self._paths.get(file_hash)
+
+    def move_file(self, file_hash: str, path: str, stat: tuple[int, int, int]) -> None:
+        """
+        Track known content under a new path, e.g. after a rename.
+        """
+        with self._lock:
+            old_path = self._paths.get(file_hash)
+            if old_path is None or old_path == path:
+                return
+            if self._hashes.get(old_path) == file_hash:
+                del self._hashes[old_path]
+                self._stats.pop(old_path, None)
+            if file_hash in self._retry:
+                self._retry[file_hash] = path
+                self._retry_paths.discard(old_path)
+                self._retry_paths.add(path)
+            self._paths[file_hash] = path
+            self._hashes[path] = file_hash
+            self._stats[path] = stat
+            size, mtime_ns, inode = stat
+            record = {
+                "path": path,
+                "hash": file_hash,
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "inode": inode,
+            }
+            if file_hash in self._new:
+                self._new[file_hash].update(record)
+            else:
+                self._stat_updates.append(record)
+                self._maybe_flush()
+
+    def remove_file(self, file_hash: str) -> None:
+        """
+        Forget a tracked file, e.g. an outdated version of a changed file.
+        """
+        with self._lock:
+            path = self._paths.pop(file_hash, None)
+            if path is None:
+                return
+            if self._hashes.get(path) == file_hash:
+                del self._hashes[path]
+                self._stats.pop(path, None)
+            self._retry.pop(file_hash, None)
+            self._states.pop(file_hash, None)
+            self._errors.pop(file_hash, None)
+            if self._new.pop(file_hash, None) is None:
+                self._removed.append(file_hash)
+                self._maybe_flush()
+
+    def update_stat(
+        self, path: str, file_hash: str, stat: tuple[int, int, int]
+    ) -> None:
+        with self._lock:
+            if self._paths.get(file_hash) != path or self._stats.get(path) == stat:
+                return
+            size, mtime_ns, inode = stat
+            self._stats[path] = stat
+            self._stat_updates.append(
+                {
+                    "path": path,
+                    "hash": file_hash,
+                    "size": size,
+                    "mtime_ns": mtime_ns,
+                    "inode": inode,
+                }
+            )
+            self._maybe_flush()
+
+    def mark_extracted(self, file_hash: str) -> None:
+        """
+        Record that all parts of a file were extracted and handed over.
+        """
+        with self._lock:
+            self._set_state(file_hash, FileState.EXTRACTED)
+            self._extracted.append(file_hash)
+
+    def mark_failed(self, file_hash: str, reason: str) -> None:
+        """
+        Record that a file could not be extracted, later runs skip it
+        unless forced.
+        """
+        with self._lock:
+            self.failed += 1
+            self._failed.add(file_hash)
+            if file_hash in self._new:
+                self._new[file_hash]["error"] = reason
+            else:
+                self._errors[file_hash] = reason
+            self._set_state(file_hash, FileState.FAILED)
+
+    def failed_among(self, hashes: Iterable[str]) -> list[str]:
+        """
+        Return the hashes that failed extraction during this run.
+        """
+        with self._lock:
+            return [h for h in hashes if h in self._failed]
+
+    def take_extracted(self) -> list[str]:
+        """
+        Return hashes of files extracted since the last call.
+        """
+        with self._lock:
+            extracted, self._extracted = self._extracted, []
+            return extracted
+
+    def set_state(self, hashes: list[str], state: FileState) -> None:
+        with self._lock:
+            for file_hash in hashes:
+                self._set_state(file_hash, state)
+
+    def flush(self) -> None:
+        """
+        Write buffered records to the db.
+        """
+        with self._lock:
+            # removals first, they free paths reused by new records
+            if self._removed:
+                self.tracker.remove_files(self._removed)
+                self._removed = []
+            if self._new:
+                self.tracker.add_files(list(self._new.values()))
+                self._new = {}
+            if self._stat_updates:
+                self.tracker.update_stats(self._stat_updates)
+                self._stat_updates = []
+            if self._states:
+                self.tracker.set_states(self._states, self._errors)
+                self._states = {}
+                self._errors = {}
+
+    def _set_state(self, file_hash: str, state: FileState) -> None:
+        if file_hash in self._new:
+            self._new[file_hash]["state"] = state
+        else:
+            self._states[file_hash] = state
+            if state != FileState.FAILED:
+                self._errors.pop(file_hash, None)
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        pending = (
+            len(self._removed)
+            + len(self._new)
+            + len(self._stat_updates)
+            + len(self._states)
+        )
+        if pending >= self.write_batch:
+            self.flush()
@@ -0,0 +1,163 @@
+import json
+import logging
+from datetime import UTC, datetime
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from mnemolet.cuore.storage.base_db import BaseDatabaseManager
+from mnemolet.cuore.storage.models import IngestJob, JobState
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATES = {JobState.DONE, JobState.FAILED, JobState.CANCELLED}
+
+
+class JobStore(BaseDatabaseManager):
+    def create_job(
+        self, files: list[str], force: bool = False, resume: bool = False
+    ) -> int:
+        """Queue an ingest job for files and return its ID."""
+        with self.get_session() as session:
+            try:
+                job = IngestJob(
+                    state=JobState.QUEUED,
+                    files=json.dumps(files),
+                    force=force,
+                    resume=resume,
+                    created_at=datetime.now(UTC),
+                )
+                session.add(job)
+                session.commit()
+                logger.debug(f"Queued ingest job {job.id}: {len(files)} files")
+                return job.id
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error creating ingest job: {e}")
+                raise
+
+    def get_job(self, job_id: int) -> Optional[dict]:
+        """Get a job with its files and progress, None if unknown."""
+        with self.get_session() as session:
+            job = session.get(IngestJob, job_id)
+            return _to_dict(job) if job else None
+
+    def next_queued(self) -> Optional[dict]:
+        """Claim the oldest queued job (marked running), None if idle."""
+        with self.get_session() as session:
+            try:
+                job = session.execute(
+                    select(IngestJob)
+                    .where(IngestJob.state == JobState.QUEUED)
+                    .order_by(IngestJob.id)
+                    .limit(1)
+                ).scalar_one_or_none()
+                if job is None:
+                    return None
+                job.state = JobState.RUNNING
+                job.started_at = datetime.now(UTC)
+                session.commit()
+                return _to_dict(job)
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error claiming ingest job: {e}")
+                raise
+
+    def update_progress(self, job_id: int, progress: dict) -> None:
+        """Store the latest progress snapshot of a running job."""
+        self._update(job_id, progress=json.dumps(progress))
+
+    def finish(
+        self,
+        job_id: int,
+        state: JobState,
+        progress: Optional[dict] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Move a job to a final state."""
+        values = {"state": state, "error": error, "finished_at": datetime.now(UTC)}
+        if progress is not None:
+            values["progress"] = json.dumps(progress)
+        self._update(job_id, **values)
+
+    def request_cancel(self, job_id: int) -> bool:
+        """
+        Cancel a queued job right away, ask a running one to stop.
+
+        Returns False if the job is unknown or already finished.
+        """
+        with self.get_session() as session:
+            try:
+                job = session.get(IngestJob, job_id)
+                if job is None or job.state in FINISHED_STATES:
+                    return False
+                job.cancel_requested = True
+                if job.state == JobState.QUEUED:
+                    job.state = JobState.CANCELLED
+                    job.finished_at = datetime.now(UTC)
+                session.commit()
+                return True
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error cancelling ingest job {job_id}: {e}")
+                raise
+
+    def cancel_requested(self, job_id: int) -> bool:
+        """Check if a job was asked to stop."""
+        with self.get_session() as session:
+            return bool(
+                session.execute(
+                    select(IngestJob.cancel_requested).where(IngestJob.id == job_id)
+                ).scalar()
+            )
+
+    def requeue_running(self) -> int:
+        """
+        Queue jobs a previous process left running, to be resumed.
+
+        Returns the number of requeued jobs.
+        """
+        with self.get_session() as session:
+            try:
+                result = session.execute(
+                    update(IngestJob)
+                    .where(IngestJob.state == JobState.RUNNING)
+                    .values(state=JobState.QUEUED, resume=True)
+                )
+                session.commit()
+                if result.rowcount:
+                    logger.info(f"Requeued {result.rowcount} interrupted ingest jobs")
+                return result.rowcount
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error requeueing ingest jobs: {e}")
+                raise
+
+    def _update(self, job_id: int, **values) -> None:
+        with self.get_session() as session:
+            try:
+                session.execute(
+                    update(IngestJob).where(IngestJob.id == job_id).values(**values)
+                )
+                session.commit()
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.error(f"Error updating ingest job {job_id}: {e}")
+                raise
+
+
+def _to_dict(job: IngestJob) -> dict:
+    return {
+        "id": job.id,
+        "state": job.state,
+        "files": json.loads(job.files),
+        "force": job.force,
+        "resume": job.resume,
+        "cancel_requested": job.cancel_requested,
+        "progress": json.loads(job.progress) if job.progress else {},
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
@@ -1,11 +1,35 @@
 from datetime import datetime
-
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from enum import StrEnum
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import Mapped, declarative_base, mapped_column, relationship
 
 Base = declarative_base()
 
 
+class FileState(StrEnum):
+    """
+    Ingestion progress of a tracked file.
+
+    discovered -> extracted -> embedded -> indexed
+    discovered -> failed (extraction error, skipped unless forced)
+    """
+
+    DISCOVERED = "discovered"
+    EXTRACTED = "extracted"
+    EMBEDDED = "embedded"
+    INDEXED = "indexed"
+    FAILED = "failed"
+
+
 class FileRecord(Base):
     """ORM model for tracking files."""
 
@@ -18,9 +42,80 @@ class FileRecord(Base):
         DateTime(timezone=True), nullable=False
     )
     indexed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # rows from before the state machine are assumed complete
+    state: Mapped[str] = mapped_column(
+        String, nullable=False, server_default=FileState.INDEXED.value
+    )
+    # stat snapshot, lets re-ingest skip hashing unchanged files
+    size: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    mtime_ns: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    inode: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # why extraction failed, set with state failed
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    def __repr__(self):
+        return f"<FileRecord(id={self.id}, path='{self.path}', state={self.state})>"
+
+
+class ChunkRecord(Base):
+    """ORM model mapping chunk content to a point holding its vector."""
+
+    __tablename__ = "chunks"
+
+    hash: Mapped[str] = mapped_column(String, primary_key=True)
+    point_id: Mapped[str] = mapped_column(String, nullable=False)
+
+    def __repr__(self):
+        return f"<ChunkRecord(hash='{self.hash}', point_id='{self.point_id}')>"
+
+
+class JobState(StrEnum):
+    """
+    Lifecycle of a background ingest job.
+
+    queued -> running -> done | failed | cancelled
+    running -> queued (server restarted mid-job)
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class IngestJob(Base):
+    """ORM model for background ingest jobs."""
+
+    __tablename__ = "ingest_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    state: Mapped[str] = mapped_column(
+        String, nullable=False, default=JobState.QUEUED.value
+    )
+    # JSON list of file paths to ingest
+    files: Mapped[str] = mapped_column(Text, nullable=False)
+    force: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # re-run after a restart, finishes files the interrupted run left
+    resume: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    cancel_requested: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False
+    )
+    # JSON: files/chunks so far and stage timings, the ingest result when done
+    progress: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     def __repr__(self):
-        return f"<FileRecord(id={self.id}, path='{self.path}', indexed={self.indexed})>"
+        return f"<IngestJob(id={self.id}, state={self.state})>"
 
 
 class ChatSession(Base):
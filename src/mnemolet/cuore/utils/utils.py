@@ -1,4 +1,5 @@
 import hashlib
+import os
 from pathlib import Path
 from typing import Any
 
@@ -45,3 +46,18 @@ def hash_file(path: Path) -> str:
         for chunk in iter(lambda: f.read(8192), b""):
             hasher.update(chunk)
     return hasher.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """
+    Return SHA256 hash of a text (e.g. a chunk)
+    """
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def file_stat(st: os.stat_result) -> tuple[int, int, int]:
+    """
+    Return (size, mtime_ns, inode) from a stat result, used to detect
+    changes without reading file content.
+    """
+    return st.st_size, st.st_mtime_ns, st.st_ino
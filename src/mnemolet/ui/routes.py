@@ -45,14 +45,15 @@ async def ingest_form(request: Request):
 
 @ui_router.post("/ingest", response_class=HTMLResponse)
 async def ingest_submit(request: Request, files: list[UploadFile] = File(...)):
-    saved_files, result = await do_ingestion(files, force=False)
+    saved_files, known_files, job_id = await do_ingestion(files, force=False)
 
     return templates.TemplateResponse(
         "ingest.html",
         {
             "request": request,
             "saved": saved_files,
-            "result": result,
+            "known": known_files,
+            "job_id": job_id,
         },
     )
 
@@ -1,7 +1,8 @@
 import os
 
 from mnemolet.config import DB_PATH
-from mnemolet.cuore.storage.db_tracker import DBTracker
+from mnemolet.cuore.storage.db_tracker import DBTracker, FileIndex
+from mnemolet.cuore.storage.models import FileState
 
 
 def setup_module(module):
@@ -27,3 +28,84 @@ def test_add_and_list_files():
     tracker.mark_indexed(file_hash)
     indexed_files = tracker.list_files(indexed=True)
     assert len(indexed_files) == 1
+
+
+def test_stat_snapshot():
+    tracker = DBTracker()
+    path = "stat.txt"
+    file_hash = "stat_hash"
+
+    tracker.add_file(path, file_hash, (10, 1000, 42))
+    assert tracker.is_unchanged(path, (10, 1000, 42)) is True
+    assert tracker.is_unchanged(path, (10, 2000, 42)) is False
+
+    tracker.update_stat(path, file_hash, (10, 2000, 42))
+    assert tracker.is_unchanged(path, (10, 2000, 42)) is True
+
+
+def test_file_index_batches_writes():
+    tracker = DBTracker()
+    index = FileIndex(tracker, write_batch=3)
+
+    index.add_file("bulk1.txt", "bulk_hash1", (1, 1, 1))
+    index.add_file("bulk2.txt", "bulk_hash2", (2, 2, 2))
+    assert index.file_exists("bulk_hash1") is True
+    # still buffered
+    assert tracker.file_exists("bulk_hash1") is False
+
+    index.add_file("bulk3.txt", "bulk_hash3", (3, 3, 3))
+    assert tracker.file_exists("bulk_hash1") is True
+
+    index.update_stat("bulk1.txt", "bulk_hash1", (1, 5, 1))
+    index.flush()
+    assert tracker.is_unchanged("bulk1.txt", (1, 5, 1)) is True
+
+    known = tracker.known_hashes()
+    assert known["bulk_hash2"] == "bulk2.txt"
+    assert tracker.stat_snapshots()["bulk3.txt"] == (3, 3, 3)
+
+
+def test_file_index_states_and_resume():
+    tracker = DBTracker()
+    index = FileIndex(tracker)
+
+    index.add_file("state.txt", "state_hash", (1, 1, 1))
+    index.mark_extracted("state_hash")
+    assert index.take_extracted() == ["state_hash"]
+    assert index.take_extracted() == []
+    index.flush()
+
+    # interrupted before indexing: known, unless resuming
+    assert FileIndex(tracker).file_exists("state_hash") is True
+    assert tracker.is_indexed("state_hash") is False
+    resumed = FileIndex(tracker, resume=True)
+    assert resumed.file_exists("state_hash") is False
+    assert resumed.is_unchanged("state.txt", (1, 1, 1)) is False
+    # files outside the run are neither resumed nor purged
+    other = FileIndex(tracker, resume=True, paths=["other.txt"])
+    assert "state_hash" not in other.incomplete
+    assert other.file_exists("state_hash") is True
+
+    resumed.set_state(["state_hash"], FileState.INDEXED)
+    resumed.flush()
+    assert "state_hash" not in tracker.incomplete_files()
+    assert tracker.is_indexed("state_hash") is True
+    files = {f["path"]: f for f in tracker.list_files(indexed=True)}
+    assert files["state.txt"]["state"] == FileState.INDEXED
+
+
+def test_file_index_mark_failed():
+    tracker = DBTracker()
+    index = FileIndex(tracker)
+
+    index.add_file("broken.pdf", "broken_hash", (1, 1, 1))
+    index.mark_failed("broken_hash", "timed out after 5s")
+    index.flush()
+    assert index.failed == 1
+
+    files = {f["path"]: f for f in tracker.list_files()}
+    assert files["broken.pdf"]["state"] == FileState.FAILED
+    assert files["broken.pdf"]["error"] == "timed out after 5s"
+    # not an interrupted file, resume leaves it alone
+    assert "broken_hash" not in tracker.incomplete_files()
+    assert FileIndex(tracker, resume=True).file_exists("broken_hash") is True
@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from mnemolet.cuore.ingestion.dedup import ChunkDedup
+from mnemolet.cuore.storage.db_tracker import DBTracker
+
+
+def fake_embed(texts):
+    return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_identical_chunks_are_embedded_once():
+    tracker = DBTracker()
+    tracker.clear_chunks()
+    indexer = MagicMock()
+    indexer.retrieve_vectors.return_value = {}
+    embed = MagicMock(side_effect=fake_embed)
+    dedup = ChunkDedup(tracker, indexer, embed)
+
+    chunks = ["licence header", "body one", "licence header"]
+    vectors, hashes = dedup.embed(chunks)
+
+    embed.assert_called_once_with(["licence header", "body one"])
+    assert vectors.shape == (3, 2)
+    assert np.array_equal(vectors[0], vectors[2])
+    assert hashes[0] == hashes[2]
+
+    dedup.record(hashes, ["p1", "p2", "p3"])
+    # next batch: known chunk comes from its stored point
+    indexer.retrieve_vectors.return_value = {"p3": np.array([9.0, 9.0])}
+    embed.reset_mock()
+    vectors, _ = dedup.embed(["licence header", "body two"])
+
+    indexer.retrieve_vectors.assert_called_with(["p3"])
+    embed.assert_called_once_with(["body two"])
+    assert vectors[0].tolist() == [9.0, 9.0]
+    assert (dedup.embedded, dedup.reused) == (3, 2)
+
+
+def test_other_model_does_not_reuse_vectors():
+    tracker = DBTracker()
+    tracker.clear_chunks()
+    indexer = MagicMock()
+    indexer.retrieve_vectors.return_value = {}
+
+    _, old_hashes = ChunkDedup(tracker, indexer, fake_embed, "old@torch").embed(
+        ["shared chunk"]
+    )
+    tracker.add_chunks({old_hashes[0]: "p-old"})
+
+    embed = MagicMock(side_effect=fake_embed)
+    _, new_hashes = ChunkDedup(tracker, indexer, embed, "new@int8").embed(
+        ["shared chunk"]
+    )
+    assert new_hashes != old_hashes
+    embed.assert_called_once_with(["shared chunk"])
+    indexer.retrieve_vectors.assert_called_with([])
@@ -0,0 +1,89 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from mnemolet.cuore.embeddings import local_llm_embed
+from mnemolet.cuore.embeddings.cache import EmbeddingCache
+from mnemolet.cuore.utils.utils import hash_text
+
+
+class FakeModel:
+    def __init__(self):
+        self.encoded = []
+
+    def get_embedding_dimension(self):
+        return 3
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        return np.array([[len(t), 1.0, 0.0] for t in texts], dtype=np.float32)
+
+
+def test_cache_roundtrip_and_reopen():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_dir = Path(tmpdir)
+        cache = EmbeddingCache("model", 3, cache_dir=cache_dir)
+        hashes = [hash_text("a"), hash_text("b")]
+        vectors = np.array([[1, 2, 3], [4, 5, 6]], dtype=np.float32)
+
+        cache.put(hashes, vectors)
+        cache.put(hashes[:1], vectors[1:])  # already cached, ignored
+        assert len(cache) == 2
+
+        reopened = EmbeddingCache("model", 3, cache_dir=cache_dir)
+        found = reopened.get([hashes[1], hash_text("c")])
+        assert list(found) == [hashes[1]]
+        assert np.array_equal(found[hashes[1]], vectors[1])
+
+        # other normalization is another cache
+        other = EmbeddingCache("model", 3, normalize=True, cache_dir=cache_dir)
+        assert len(other) == 0
+
+
+def test_cache_survives_torn_tail():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_dir = Path(tmpdir)
+        cache = EmbeddingCache("model", 3, cache_dir=cache_dir)
+        cache.put([hash_text("a")], np.ones((1, 3), dtype=np.float32))
+        # interrupted append: half a row, no entry
+        with open(cache.vec_path, "ab") as f:
+            f.write(b"\0" * 6)
+
+        reopened = EmbeddingCache("model", 3, cache_dir=cache_dir)
+        reopened.put([hash_text("b")], np.full((1, 3), 2, dtype=np.float32))
+
+        again = EmbeddingCache("model", 3, cache_dir=cache_dir)
+        found = again.get([hash_text("a"), hash_text("b")])
+        assert np.array_equal(found[hash_text("a")], [1, 1, 1])
+        assert np.array_equal(found[hash_text("b")], [2, 2, 2])
+
+
+def test_embed_texts_batch_reads_cache():
+    model = FakeModel()
+    texts = ["one", "three", "one"]
+    with (
+        tempfile.TemporaryDirectory() as tmpdir,
+        patch.object(local_llm_embed, "_model", model),
+        patch.object(local_llm_embed, "_caches", {}),
+        patch.object(local_llm_embed, "EmbeddingCache", _cache_in(Path(tmpdir))),
+    ):
+        first = np.vstack(
+            list(local_llm_embed.embed_texts_batch(texts, use_cache=True))
+        )
+        assert model.encoded == ["one", "three"]
+
+        again = np.vstack(
+            list(local_llm_embed.embed_texts_batch(texts, use_cache=True))
+        )
+    assert model.encoded == ["one", "three"]
+    assert np.array_equal(first, again)
+    assert again[0, 0] == 3 and again[1, 0] == 5
+
+
+def _cache_in(cache_dir):
+    def make(model_id, dim, normalize):
+        return EmbeddingCache(model_id, dim, normalize, cache_dir=cache_dir)
+
+    return make
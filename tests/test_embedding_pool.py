@@ -0,0 +1,59 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from sentence_transformers import SentenceTransformer, models
+from transformers import BertConfig, BertModel, BertTokenizerFast
+
+from mnemolet.cuore.embeddings.local_llm_embed import _encode_texts
+from mnemolet.cuore.embeddings.pool import EmbeddingPool
+
+
+def tiny_model(path: Path) -> str:
+    """
+    Save a small random BERT sentence model, no download needed.
+    """
+    vocab = path / "vocab.txt"
+    vocab.write_text(
+        "\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *"abcdefghij"])
+    )
+    BertModel(
+        BertConfig(
+            vocab_size=15,
+            hidden_size=16,
+            num_hidden_layers=1,
+            num_attention_heads=2,
+            intermediate_size=32,
+        )
+    ).save_pretrained(path / "hf")
+    BertTokenizerFast(vocab_file=str(vocab)).save_pretrained(path / "hf")
+    model = SentenceTransformer(
+        modules=[models.Transformer(str(path / "hf")), models.Pooling(16)]
+    )
+    model.save(str(path / "st"))
+    return str(path / "st")
+
+
+def test_pool_matches_in_process_encoding():
+    texts = [" ".join("abcdefghij"[: i % 10 + 1]) for i in range(40)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        model_path = tiny_model(Path(tmpdir))
+
+        pool = EmbeddingPool(2, threads=1, model_name=model_path, backend="torch")
+        try:
+            with patch.object(pool._pool, "submit", wraps=pool._pool.submit) as submit:
+                vectors = pool.encode(texts, False, 32, True)
+            stats = pool.stats()
+        finally:
+            pool.close()
+
+        expected = _encode_texts(
+            SentenceTransformer(model_path), texts, False, False, 32, True
+        )
+    # one shard per worker even with a larger encode batch
+    assert [len(c.args[1]) for c in submit.call_args_list] == [20, 20]
+    assert np.allclose(vectors, expected, atol=1e-5)
+    # a worker done first may take both shards
+    assert set(stats) <= {0, 1}
+    assert sum(s["chunks"] for s in stats.values()) == len(texts)
@@ -1,6 +1,14 @@
+from unittest.mock import patch
+
 import numpy as np
+import pytest
 
-from mnemolet.cuore.embeddings.local_llm_embed import embed_texts_batch
+from mnemolet.cuore.embeddings import local_llm_embed
+from mnemolet.cuore.embeddings.local_llm_embed import (
+    cosine_similarities,
+    embed_texts_batch,
+    load_model,
+)
 
 
 def test_embed_texts_batch_basic():
@@ -37,3 +45,60 @@ def test_embed_texts_batch_empty():
     embeddings = list(embed_texts_batch([]))
 
     assert embeddings == []
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        load_model("all-MiniLM-L6-v2", "tpu")
+
+
+def test_cosine_similarities():
+    reference = np.array([[1.0, 0.0], [0.0, 2.0]], dtype=np.float32)
+    other = np.array([[3.0, 0.0], [1.0, 1.0]], dtype=np.float32)
+
+    cosines = cosine_similarities(reference, other)
+    assert np.allclose(cosines, [1.0, np.sqrt(0.5)])
+
+
+class FakeModel:
+    """
+    Sorts each encode call by length like SentenceTransformer.encode.
+    """
+
+    def __init__(self):
+        self.passes = []
+
+    def get_embedding_dimension(self):
+        return 3
+
+    def encode(self, texts, batch_size, **kwargs):
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for i in range(0, len(order), batch_size):
+            self.passes.append([texts[r] for r in order[i : i + batch_size]])
+        return np.array([[len(t), 1.0, 0.0] for t in texts], dtype=np.float32)
+
+
+def encode_passes(texts: list[str], bucketing: bool) -> list[list[str]]:
+    model = FakeModel()
+    with patch.object(local_llm_embed, "_model", model):
+        batches = embed_texts_batch(
+            texts, use_cache=False, encode_batch=2, bucketing=bucketing
+        )
+        out = np.vstack(list(batches))
+    assert out[:, 0].tolist() == [len(t) for t in texts]
+    return model.passes
+
+
+def test_bucketing_groups_whole_batch():
+    texts = ["medium", "a", "the longest text", "ab"]
+
+    # shortest texts of the batch share a forward pass
+    assert encode_passes(texts, bucketing=True) == [
+        ["a", "ab"],
+        ["medium", "the longest text"],
+    ]
+    # without, only texts within encode_batch of each other are sorted
+    assert encode_passes(texts, bucketing=False) == [
+        ["a", "medium"],
+        ["ab", "the longest text"],
+    ]
@@ -1,11 +1,48 @@
+import re
 import tempfile
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
+from unittest.mock import patch
 
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from mnemolet.cuore.ingestion.loader import _extract_parts
+from mnemolet.cuore.ingestion.loaders.pdf_loader import extract_pdf
 from mnemolet.cuore.ingestion.preprocessor import process_directory
+from mnemolet.cuore.ingestion.sandbox import ExtractionError, SandboxWorker
 from mnemolet.cuore.storage.db_tracker import DBTracker
+from mnemolet.cuore.storage.models import FileState
 from mnemolet.cuore.utils.utils import hash_file
 
 
+def write_pdf(path: Path, texts: list[str]) -> None:
+    """
+    Write a PDF with one line of text per page.
+    """
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for text in texts:
+        page = writer.add_blank_page(300, 300)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 10 150 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
 def test_load_txt_files():
     with tempfile.TemporaryDirectory() as tmpdir:
         tmp_path = Path(tmpdir)
@@ -22,7 +59,8 @@ def test_load_txt_files():
         assert len(files) == 2
 
         for f in files:
-            assert set(f.keys()) == {"path", "hash", "chunk"}
+            assert set(f.keys()) == {"path", "hash", "chunk", "index", "start", "end"}
+            assert f["end"] - f["start"] == len(f["chunk"])
             assert f["path"].endswith(".txt")
             assert len(f["chunk"]) > 0
             assert f["hash"] == hash_file(Path(f["path"]))
@@ -31,3 +69,216 @@ def test_load_txt_files():
         chunks = [f["chunk"] for f in files]
         assert any("Hello world" in c for c in chunks)
         assert any("Another file" in c for c in chunks)
+
+
+def test_load_txt_files_parallel():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+
+        for i in range(4):
+            (tmp_path / f"file{i}.txt").write_text(f"Parallel {i}", encoding="utf-8")
+
+        tracker = DBTracker()
+        files = list(
+            process_directory(tmp_path, tracker, force=True, max_length=3000, workers=2)
+        )
+
+        assert len(files) == 4
+        assert {f["chunk"] for f in files} == {f"Parallel {i}" for i in range(4)}
+        for f in files:
+            assert f["hash"] == hash_file(Path(f["path"]))
+
+
+def test_parallel_extracts_duplicate_content_once():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        for name in ("copy_a.txt", "copy_b.txt"):
+            (tmp_path / name).write_text("Same parallel content", encoding="utf-8")
+
+        tracker = DBTracker()
+        files = list(
+            process_directory(tmp_path, tracker, force=True, max_length=3000, workers=2)
+        )
+
+        # both copies map to the same point ids, one is enough
+        assert [f["chunk"] for f in files] == ["Same parallel content"]
+
+
+def test_parallel_extraction_caps_text():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = Path(tmpdir) / "large.txt"
+        file_path.write_text("x" * 100, encoding="utf-8")
+
+        assert _extract_parts(file_path, max_chars=0) == ["x" * 100]
+        with pytest.raises(ValueError, match="exceeds 50 chars"):
+            _extract_parts(file_path, max_chars=50)
+
+
+def test_unchanged_files_skip_hashing():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        (tmp_path / "stat.txt").write_text("Unchanged file", encoding="utf-8")
+
+        tracker = DBTracker()
+        first = list(process_directory(tmp_path, tracker, force=True, max_length=3000))
+        assert len(first) == 1
+
+        with patch("mnemolet.cuore.ingestion.loader.hash_file") as hash_mock:
+            again = list(process_directory(tmp_path, tracker, False, 3000))
+        assert again == []
+        hash_mock.assert_not_called()
+
+        # verify forces hashing, content is known so nothing is yielded
+        verified = list(process_directory(tmp_path, tracker, False, 3000, verify=True))
+        assert verified == []
+
+
+def test_modified_file_purges_old_version():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        file_path = tmp_path / "changing.txt"
+        file_path.write_text("First version", encoding="utf-8")
+        (tmp_path / "steady.txt").write_text("Steady file", encoding="utf-8")
+
+        tracker = DBTracker()
+        list(process_directory(tmp_path, tracker, force=True, max_length=3000))
+        old_hash = hash_file(file_path)
+
+        file_path.write_text("Second, longer version", encoding="utf-8")
+        purged = []
+        chunks = list(
+            process_directory(tmp_path, tracker, False, 3000, purge=purged.extend)
+        )
+
+        assert purged == [old_hash]
+        assert [c["path"] for c in chunks] == [str(file_path.resolve())]
+        assert not tracker.file_exists(old_hash)
+        assert tracker.file_exists(hash_file(file_path))
+
+
+def test_force_purges_only_reingested_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        file_path = tmp_path / "forced.txt"
+        file_path.write_text("Forced again", encoding="utf-8")
+
+        tracker = DBTracker()
+        list(process_directory(tmp_path, tracker, force=True, max_length=3000))
+
+        purged = []
+        chunks = list(
+            process_directory(tmp_path, tracker, True, 3000, purge=purged.extend)
+        )
+        assert purged == [hash_file(file_path)]
+        assert [c["chunk"] for c in chunks] == ["Forced again"]
+
+
+def test_failure_mid_file_purges_partial_points():
+    class BrokenExtractor:
+        def extract(self, path, file_hash=None):
+            yield "First part of the file. "
+            yield "Second part. "
+            raise ValueError("truncated stream")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        file_path = tmp_path / "broken.txt"
+        file_path.write_text("Never read", encoding="utf-8")
+
+        tracker = DBTracker()
+        purged = []
+        with patch(
+            "mnemolet.cuore.ingestion.loader.get_extractor",
+            return_value=BrokenExtractor(),
+        ):
+            chunks = list(
+                process_directory(tmp_path, tracker, True, 3000, purge=purged.extend)
+            )
+
+        # the first part was buffered by the chunker, nothing goes out
+        assert chunks == []
+        assert purged == [hash_file(file_path)]
+        record = {f["hash"]: f for f in tracker.list_files()}[purged[0]]
+        assert record["state"] == FileState.FAILED
+        assert record["error"] == "ValueError: truncated stream"
+
+
+def test_sandbox_records_failed_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf at all")
+        (tmp_path / "fine.txt").write_text("Sandboxed text", encoding="utf-8")
+
+        tracker = DBTracker()
+        chunks = list(process_directory(tmp_path, tracker, True, 3000, sandbox=True))
+        assert [c["chunk"] for c in chunks] == ["Sandboxed text"]
+
+        files = {f["path"]: f for f in tracker.list_files()}
+        record = files[str(broken.resolve())]
+        assert record["state"] == FileState.FAILED
+        assert record["error"].startswith("Pdf")
+
+        # failed files are skipped, force retries them
+        assert list(process_directory(tmp_path, tracker, False, 3000)) == []
+        list(process_directory(tmp_path, tracker, True, 3000))
+        files = {f["path"]: f for f in tracker.list_files()}
+        assert files[str(broken.resolve())]["error"].startswith("Pdf")
+
+
+def test_sandbox_worker_timeout():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = Path(tmpdir) / "slow.txt"
+        file_path.write_text("Never read", encoding="utf-8")
+
+        worker = SandboxWorker(timeout=0.01, max_memory=0)
+        try:
+            with pytest.raises(ExtractionError, match="timed out"):
+                worker.extract(file_path)
+            # a fresh child takes over after the kill
+            worker.timeout = 0
+            assert worker.extract(file_path) == ["Never read"]
+        finally:
+            worker.close()
+
+
+def test_pdf_chunks_carry_page_numbers():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        write_pdf(tmp_path / "manual.pdf", [f"Page {i} text" for i in range(1, 7)])
+
+        tracker = DBTracker()
+        chunks = list(process_directory(tmp_path, tracker, force=True, max_length=25))
+
+        assert chunks[0]["chunk"].startswith("Page 1 text")
+        assert chunks[0]["page_start"] == 1
+        assert chunks[-1]["page_end"] == 6
+        for c in chunks:
+            pages = [int(n) for n in re.findall(r"Page (\d+)", c["chunk"])]
+            assert all(c["page_start"] <= n <= c["page_end"] for n in pages)
+
+
+def test_pdf_page_pool_reuse_and_small_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        write_pdf(tmp_path / "short.pdf", ["Only page"])
+        write_pdf(tmp_path / "long.pdf", [f"Page {i}" for i in range(1, 21)])
+
+        shared = ThreadPool(2)
+        try:
+            with patch(
+                "mnemolet.cuore.ingestion.loaders.pdf_loader.page_pool"
+            ) as new_pool:
+                # a single page range is extracted in process
+                short = list(extract_pdf(tmp_path / "short.pdf", 100, workers=4))
+                long = list(
+                    extract_pdf(
+                        tmp_path / "long.pdf", 10**6, workers=4, get_pool=lambda: shared
+                    )
+                )
+            new_pool.assert_not_called()
+        finally:
+            shared.terminate()
+
+        assert short == ["Only page\n"]
+        assert [page for _, page in long[0].marks] == list(range(1, 21))
@@ -0,0 +1,76 @@
+import tempfile
+from pathlib import Path
+
+from mnemolet.cuore.ingestion.jobs import IngestWorker
+from mnemolet.cuore.storage.job_store import JobStore
+from mnemolet.cuore.storage.models import JobState
+
+
+def fake_ingest(files, *args, progress=None, **kwargs):
+    # the worker keeps the embedding pool between jobs
+    assert kwargs["keep_pool"] is True
+    progress({"files": 1, "total_files": len(files), "chunks": 3, "stages": {}})
+    return {"files": len(files), "chunks": 3}
+
+
+def test_job_runs_and_reports_progress():
+    store = JobStore()
+    worker = IngestWorker(store, ingest_fn=fake_ingest)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        file_path = tmp_path / "doc.txt"
+        file_path.write_text("Queued text", encoding="utf-8")
+
+        job_id = worker.submit([str(file_path), str(tmp_path / "gone.txt")])
+        assert store.get_job(job_id)["state"] == JobState.QUEUED
+
+        job = store.next_queued()
+        assert job["id"] == job_id
+        assert job["resume"] is False
+        assert store.get_job(job_id)["state"] == JobState.RUNNING
+        worker.run_job(job)
+
+    job = store.get_job(job_id)
+    assert job["state"] == JobState.DONE
+    # the missing file is skipped
+    assert job["progress"] == {"files": 1, "chunks": 3}
+    assert store.request_cancel(job_id) is False
+
+
+def test_running_job_cancel_and_failure():
+    store = JobStore()
+    worker = IngestWorker(store, ingest_fn=fake_ingest)
+
+    job_id = worker.submit(["missing.txt"], resume=True)
+    job = store.next_queued()
+    assert store.request_cancel(job_id) is True
+    worker.run_job(job)
+    assert store.get_job(job_id)["state"] == JobState.CANCELLED
+    assert store.get_job(job_id)["resume"] is True
+
+    def broken_ingest(*args, **kwargs):
+        raise RuntimeError("qdrant down")
+
+    job_id = IngestWorker(store, ingest_fn=broken_ingest).submit([])
+    IngestWorker(store, ingest_fn=broken_ingest).run_job(store.next_queued())
+    job = store.get_job(job_id)
+    assert job["state"] == JobState.FAILED
+    assert job["error"] == "qdrant down"
+
+
+def test_queued_cancel_and_requeue_after_restart():
+    store = JobStore()
+
+    queued = store.create_job(["x.txt"])
+    assert store.request_cancel(queued) is True
+    assert store.get_job(queued)["state"] == JobState.CANCELLED
+
+    interrupted = store.create_job(["y.txt"])
+    assert store.next_queued()["id"] == interrupted
+    # process died while running
+    assert store.requeue_running() == 1
+    job = store.next_queued()
+    assert job["id"] == interrupted
+    assert job["resume"] is True
+    store.finish(interrupted, JobState.DONE)
@@ -0,0 +1,46 @@
+import tempfile
+from pathlib import Path
+
+from docx import Document as DocxDocument
+from odfdo import Document as OdtDocument
+from odfdo import Header, Paragraph, Span
+
+from mnemolet.cuore.ingestion.loaders.docx_loader import extract_docx
+from mnemolet.cuore.ingestion.loaders.odt_loader import extract_odt
+
+
+def test_extract_docx_streams_paragraphs():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "doc.docx"
+        doc = DocxDocument()
+        doc.add_paragraph("First paragraph")
+        p = doc.add_paragraph("Tab")
+        p.add_run().add_tab()
+        p.add_run("after")
+        table = doc.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = "cell A"
+        table.cell(0, 1).text = "cell B"
+        doc.save(path)
+
+        parts = list(extract_docx(path, chunk_size=16))
+
+        assert "".join(parts) == "First paragraph\nTab\tafter\ncell A\ncell B\n"
+        # parts end on paragraph boundaries
+        assert all(part.endswith("\n") for part in parts)
+
+
+def test_extract_odt_streams_paragraphs():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "doc.odt"
+        doc = OdtDocument("text")
+        doc.body.append(Header(1, "Title"))
+        doc.body.append(Paragraph("Spaced   out\twith tab"))
+        p = Paragraph("before ")
+        p.append(Span("spanned", style="x"))
+        p.append(" after")
+        doc.body.append(p)
+        doc.save(path)
+
+        text = "".join(extract_odt(path, chunk_size=8))
+
+        assert "Title\nSpaced   out\twith tab\nbefore spanned after\n" in text
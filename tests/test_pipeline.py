@@ -0,0 +1,29 @@
+import pytest
+
+from mnemolet.cuore.ingestion.pipeline import Pipeline
+
+
+def test_pipeline_runs_stages_in_order():
+    stored = []
+
+    with Pipeline(
+        [("double", lambda x: x * 2), ("store", stored.append)], queue_size=1
+    ) as p:
+        for i in range(10):
+            p.put(i)
+
+    assert stored == [i * 2 for i in range(10)]
+
+    timings = p.timings()
+    assert set(timings) == {"double", "store"}
+    assert all(t["busy"] >= 0 and t["wait"] >= 0 for t in timings.values())
+
+
+def test_pipeline_propagates_stage_error():
+    def fail(x):
+        raise ValueError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        with Pipeline([("fail", fail)], queue_size=1) as p:
+            for i in range(10):
+                p.put(i)
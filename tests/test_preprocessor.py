@@ -1,6 +1,20 @@
+import re
+
+from mnemolet.cuore.ingestion.chunker import (
+    CharChunker,
+    StreamingChunker,
+    TokenChunker,
+)
 from mnemolet.cuore.ingestion.preprocessor import chunk_text
 
 
+def fake_tokenizer(text, **kwargs):
+    """
+    Whitespace tokenizer with the offsets interface of HF fast tokenizers.
+    """
+    return {"offset_mapping": [m.span() for m in re.finditer(r"\S+", text)]}
+
+
 def test_chunk_text():
     text = " ".join(["word"] * 2700)
     max_chars = 500
@@ -10,3 +24,50 @@ def test_chunk_text():
     assert total_length == len(text)
 
     assert all(isinstance(c, str) for c in chunks)
+
+
+def test_char_chunker_offsets():
+    text = "abcdefghij"
+    chunks = list(CharChunker(4).split(text))
+    assert [(c.start, c.end) for c in chunks] == [(0, 4), (4, 8), (8, 10)]
+    assert all(text[c.start : c.end] == c.text for c in chunks)
+
+
+def test_token_chunker_fits_budget_and_covers_text():
+    text = " ".join(f"w{i}" for i in range(100))
+    chunker = TokenChunker(fake_tokenizer, max_tokens=16, overlap=4)
+    chunks = list(chunker.split(text))
+
+    assert all(len(c.text.split()) <= 16 for c in chunks)
+    assert all(text[c.start : c.end] == c.text for c in chunks)
+    assert chunks[0].start == 0 and chunks[-1].end == len(text)
+    # consecutive chunks overlap, nothing is skipped
+    assert all(b.start < a.end for a, b in zip(chunks, chunks[1:]))
+
+
+def test_token_chunker_prefers_sentence_boundaries():
+    text = "One two three four five six. Seven eight nine ten eleven twelve."
+    chunks = list(TokenChunker(fake_tokenizer, max_tokens=8).split(text))
+    assert [c.text for c in chunks] == [
+        "One two three four five six.",
+        "Seven eight nine ten eleven twelve.",
+    ]
+
+
+def test_streaming_chunker_carries_across_parts():
+    parts = ["alpha beta gam", "ma delta epsilon zeta eta th", "eta iota"]
+    text = "".join(parts)
+    stream = StreamingChunker(TokenChunker(fake_tokenizer, max_tokens=3))
+
+    chunks = []
+    for part in parts:
+        chunks += stream.feed(part)
+    chunks += stream.flush()
+
+    # words cut by part edges are whole again, offsets are file-relative
+    assert [c.text for c in chunks] == [
+        "alpha beta gamma",
+        "delta epsilon zeta",
+        "eta theta iota",
+    ]
+    assert all(text[c.start : c.end] == c.text for c in chunks)
@@ -1,6 +1,6 @@
 from unittest.mock import MagicMock, patch
 
-from mnemolet.cuore.indexing.qdrant_indexer import QdrantIndexer
+from mnemolet.cuore.indexing.qdrant_indexer import QdrantIndexer, point_id
 
 test_url = "http://localhost:6333"
 test_collection = "test_collection"
@@ -44,3 +44,20 @@ def test_store_embeddings(mock_client_class):
     assert len(points) == 2
     assert points[0].payload["text"] == "one"
     assert points[1].payload["text"] == "two"
+
+
+@patch("mnemolet.cuore.indexing.qdrant_indexer.QdrantClient")
+def test_store_embeddings_deterministic_ids(mock_client_class):
+    mock_client = MagicMock()
+    mock_client_class.return_value = mock_client
+
+    indexer = QdrantIndexer(test_url, test_collection, model="test-model")
+    metadata = [{"path": "p1", "hash": "h1", "index": i} for i in range(2)]
+
+    first = indexer.store_embeddings(["a", "b"], [[0.1], [0.2]], metadata)
+    retry = indexer.store_embeddings(["a", "b"], [[0.1], [0.2]], metadata)
+
+    assert first == retry
+    assert len(set(first)) == 2
+    assert first[0] == point_id("test-model", "h1", 0)
+    assert point_id("other-model", "h1", 0) != first[0]
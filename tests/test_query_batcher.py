@@ -0,0 +1,39 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from mnemolet.cuore.embeddings.query_batcher import QueryBatcher
+
+
+def test_concurrent_queries_share_calls():
+    calls = []
+    release = threading.Event()
+
+    def encode(queries):
+        calls.append(list(queries))
+        # hold the first call so the other queries queue up behind it
+        release.wait(timeout=5)
+        return np.array([[len(q), i] for i, q in enumerate(queries)], dtype=float)
+
+    batcher = QueryBatcher(encode, max_wait_ms=50, max_batch=4)
+    queries = ["a" * n for n in range(1, 10)]
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        futures = [pool.submit(batcher.embed, q) for q in queries]
+        release.set()
+        vectors = [f.result(timeout=5) for f in futures]
+
+    # every caller gets the vector of its own query
+    assert [v[0] for v in vectors] == [len(q) for q in queries]
+    assert len(calls) < len(queries)
+    assert max(len(c) for c in calls) <= 4
+
+
+def test_encode_error_reaches_every_caller():
+    def encode(queries):
+        raise RuntimeError("model gone")
+
+    batcher = QueryBatcher(encode, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="model gone"):
+        batcher.embed("query")
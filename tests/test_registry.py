@@ -0,0 +1,24 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from mnemolet.cuore.ingestion.extractors import registry
+from mnemolet.cuore.ingestion.extractors.audio_extractor import AudioExtractor
+from mnemolet.cuore.ingestion.extractors.text_extractor import TextExtractor
+
+
+def test_extractors_are_built_on_first_use():
+    registry.release_extractors()
+
+    with patch.object(AudioExtractor, "__init__") as audio_init:
+        assert ".mp3" in registry.supported_extensions()
+        extractor = registry.get_extractor(Path("notes.txt"))
+        audio_init.assert_not_called()
+
+    assert isinstance(extractor, TextExtractor)
+    assert registry.get_extractor(Path("other.md")) is extractor
+    assert registry.get_extractor(Path("image.png")) is None
+
+    with patch.object(TextExtractor, "close") as close:
+        registry.release_extractors()
+    close.assert_called_once()
+    assert registry.get_extractor(Path("notes.txt")) is not extractor
@@ -0,0 +1,82 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from mnemolet.cuore.ingestion.preprocessor import process_directory
+from mnemolet.cuore.ingestion.sync import sync
+from mnemolet.cuore.storage.db_tracker import DBTracker
+from mnemolet.cuore.utils.utils import hash_file
+
+
+def test_sync_removes_deleted_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        kept = tmp_path / "kept.txt"
+        gone = tmp_path / "gone.txt"
+        kept.write_text("Kept after sync", encoding="utf-8")
+        gone.write_text("Deleted before sync", encoding="utf-8")
+
+        tracker = DBTracker()
+        list(process_directory(tmp_path, tracker, force=True, max_length=3000))
+        gone_hash = hash_file(gone)
+        gone.unlink()
+
+        with patch("mnemolet.cuore.ingestion.sync.QdrantIndexer") as indexer_cls:
+            indexer = indexer_cls.return_value
+            indexer.client.collection_exists.return_value = True
+            result = sync(str(tmp_path), "http://qdrant", "test")
+
+        assert result["checked"] == 2
+        assert result["removed"] == 1
+        indexer.delete_files.assert_called_once_with([gone_hash])
+        assert not tracker.file_exists(gone_hash)
+        assert tracker.file_exists(hash_file(kept))
+
+
+def test_sync_removes_excluded_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        (tmp_path / "build").mkdir()
+        built = tmp_path / "build" / "out.txt"
+        built.write_text("Generated output", encoding="utf-8")
+        (tmp_path / "notes.txt").write_text("Kept notes", encoding="utf-8")
+
+        tracker = DBTracker()
+        list(process_directory(tmp_path, tracker, force=True, max_length=3000))
+        built_hash = hash_file(built)
+
+        with patch("mnemolet.cuore.ingestion.sync.QdrantIndexer") as indexer_cls:
+            indexer = indexer_cls.return_value
+            indexer.client.collection_exists.return_value = True
+            result = sync(str(tmp_path), "http://qdrant", "test", exclude=["build"])
+
+        assert result["checked"] == 2
+        assert result["removed"] == 1
+        indexer.delete_files.assert_called_once_with([built_hash])
+        assert not tracker.file_exists(built_hash)
+
+
+def test_sync_keeps_moved_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        old = tmp_path / "draft.txt"
+        new = tmp_path / "final.txt"
+        old.write_text("Renamed between ingest runs", encoding="utf-8")
+        moved_hash = hash_file(old)
+
+        tracker = DBTracker()
+        list(process_directory(tmp_path, tracker, force=True, max_length=3000))
+        old.rename(new)
+        # known content, not extracted again but tracked at its new path
+        assert list(process_directory(tmp_path, tracker, False, 3000)) == []
+        paths = {f["hash"]: f["path"] for f in tracker.list_files()}
+        assert paths[moved_hash] == str(new.resolve())
+
+        with patch("mnemolet.cuore.ingestion.sync.QdrantIndexer") as indexer_cls:
+            indexer = indexer_cls.return_value
+            indexer.client.collection_exists.return_value = True
+            result = sync(str(tmp_path), "http://qdrant", "test")
+
+        assert result["removed"] == 0
+        indexer.delete_files.assert_not_called()
+        assert tracker.file_exists(moved_hash)
@@ -0,0 +1,82 @@
+import tempfile
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from mnemolet.cuore.ingestion.extractors.audio_extractor import AudioExtractor
+from mnemolet.cuore.ingestion.transcriber import audio_duration, transcribe_files
+from mnemolet.cuore.ingestion.transcripts import Segment, TranscriptCache
+from mnemolet.cuore.utils.utils import hash_file
+
+SEGMENTS = [Segment(0.0, 2.5, " Hello there."), Segment(2.5, 6.0, " Second part.")]
+
+
+def test_cache_roundtrip_and_interrupted_writes():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = TranscriptCache(Path(tmpdir))
+        assert cache.get("abc", "small", None) is None
+
+        # consumer stops early: nothing is cached
+        stream = cache.put("abc", "small", None, iter(SEGMENTS))
+        next(stream)
+        stream.close()
+        assert cache.get("abc", "small", None) is None
+
+        assert list(cache.put("abc", "small", None, iter(SEGMENTS))) == SEGMENTS
+        assert list(cache.get("abc", "small", None)) == SEGMENTS
+        assert cache.get("abc", "small", "en") is None
+        assert cache.get("abc", "medium", None) is None
+
+
+def test_audio_extractor_uses_cached_transcript():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        audio = tmp_path / "talk.wav"
+        audio.write_bytes(b"RIFF fake audio")
+
+        extractor = AudioExtractor(cache=TranscriptCache(tmp_path / "cache"))
+        with patch.object(
+            AudioExtractor, "_transcribe", return_value=iter(SEGMENTS)
+        ) as transcribe:
+            first = list(extractor.extract(audio))
+            # a hash from the loader is used as is
+            with patch(
+                "mnemolet.cuore.ingestion.extractors.audio_extractor.hash_file"
+            ) as hash_mock:
+                again = list(extractor.extract(audio, hash_file(audio)))
+            hash_mock.assert_not_called()
+
+        transcribe.assert_called_once()
+        assert first == again == ["Hello there. Second part. "]
+        assert again[0].key == "time"
+        assert again[0].marks == [(0, 0.0), (13, 2.5)]
+        # the model is never loaded on cache hits
+        assert extractor.model is None
+
+
+def test_transcribe_files_skips_cached_and_reads_duration():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        audio = tmp_path / "tone.wav"
+        with wave.open(str(audio), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(b"\0\0" * 8000 * 2)
+
+        assert audio_duration(audio) == pytest.approx(2.0, abs=0.1)
+
+        cache = TranscriptCache(tmp_path / "cache")
+        list(cache.put("h1", "small", None, iter(SEGMENTS)))
+        with patch("mnemolet.cuore.ingestion.transcriber.ProcessPoolExecutor") as pool:
+            result = transcribe_files(
+                [(audio, "h1")],
+                workers=4,
+                model_size="small",
+                language="",
+                cache_dir=tmp_path / "cache",
+            )
+        pool.assert_not_called()
+        assert result["files"] == 0
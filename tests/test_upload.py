@@ -0,0 +1,35 @@
+import hashlib
+import io
+import tempfile
+from pathlib import Path
+
+from mnemolet.api.routes.ingest import store_upload
+
+
+def test_store_upload_names_by_hash():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        upload_dir = Path(tmpdir)
+        content = b"uploaded bytes " * 1000
+        digest = hashlib.sha256(content).hexdigest()
+
+        dest, file_hash = store_upload(io.BytesIO(content), ".TXT", upload_dir)
+        assert file_hash == digest
+        assert dest.name == f"{digest}.txt"
+        assert dest.read_bytes() == content
+
+        # same content again lands on the same file, no temp files left
+        again, _ = store_upload(io.BytesIO(content), ".txt", upload_dir)
+        assert again == dest
+        assert [p.name for p in upload_dir.iterdir()] == [dest.name]
+
+
+def test_store_upload_skips_known_content():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        upload_dir = Path(tmpdir)
+
+        dest, file_hash = store_upload(
+            io.BytesIO(b"known"), ".txt", upload_dir, known=lambda h: True
+        )
+        assert dest is None
+        assert file_hash == hashlib.sha256(b"known").hexdigest()
+        assert list(upload_dir.iterdir()) == []
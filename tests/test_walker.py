@@ -0,0 +1,49 @@
+import tempfile
+from pathlib import Path
+
+from mnemolet.cuore.ingestion.walker import walk_files
+
+
+def _names(entries):
+    return sorted(e.path.name for e in entries)
+
+
+def test_walk_files_filters():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        (tmp_path / "docs").mkdir()
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "docs" / "a.txt").write_text("a", encoding="utf-8")
+        (tmp_path / "docs" / "b.md").write_text("b" * 100, encoding="utf-8")
+        (tmp_path / "image.png").write_bytes(b"png")
+        (tmp_path / ".git" / "config.txt").write_text("c", encoding="utf-8")
+
+        exts = {".txt", ".md"}
+
+        entries = list(walk_files(tmp_path, exts, exclude=[".git"]))
+        assert _names(entries) == ["a.txt", "b.md"]
+        assert all(e.path.is_absolute() for e in entries)
+        assert {e.stat[0] for e in entries} == {1, 100}
+
+        assert _names(walk_files(tmp_path, exts, include=["*.md"])) == ["b.md"]
+        assert _names(walk_files(tmp_path, exts, include=["docs/*"])) == [
+            "a.txt",
+            "b.md",
+        ]
+        assert _names(walk_files(tmp_path, exts, max_file_size=10)) == [
+            "a.txt",
+            "config.txt",
+        ]
+
+
+def test_walk_files_symlinks():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        (tmp_path / "real").mkdir()
+        (tmp_path / "real" / "a.txt").write_text("a", encoding="utf-8")
+        (tmp_path / "link").symlink_to(tmp_path / "real")
+        # loop back to the root
+        (tmp_path / "real" / "loop").symlink_to(tmp_path)
+
+        assert _names(walk_files(tmp_path, {".txt"})) == ["a.txt"]
+        assert _names(walk_files(tmp_path, {".txt"}, follow_symlinks=True)) == ["a.txt"]